@@ -93,7 +93,7 @@ async function handleDropdownInput(id, value) {
     }
 }
 
-async function setFieldValue(id, value) {
+async function setFieldValue(id, value, type = null) {
     console.log(`Setting field value for ${id}:`, value);
 
     const element = await waitForElement(id);
@@ -103,6 +103,14 @@ async function setFieldValue(id, value) {
     }
 
     try {
+        // Fill plans give the control type of the field, so it is not probed
+        if (type === 'multi_select' && Array.isArray(value)) {
+            return await handleSAPMultiSelect(id, value);
+        }
+        if (type === 'select') {
+            return await handleDropdownInput(id, value);
+        }
+
         // Handle SAP multi-select components
         if (Array.isArray(value) && id.includes('__box') && 
             (element.classList.contains('sapMInputBaseInner') || 
@@ -226,9 +234,18 @@ chrome.runtime.onMessage.addListener(function(request, sender, sendResponse) {
 
         (async () => {
             try {
-                console.log("Adding rows to table");
-                await addTableRows(10);
-                await new Promise(resolve => setTimeout(resolve, 2000)); // Wait for rows to be added
+                // The mapping lambda sends a fill plan when asked: the fields to fill in form
+                // order with their control types, and the table rows they need
+                const plan = Array.isArray(request.data.actions) ? request.data : null;
+                const actions = plan ? plan.actions :
+                    Object.entries(request.data).map(([id, value]) => ({id, value, type: null}));
+                const tableRows = plan ? plan.tableRows : 10;
+
+                if (tableRows > 0) {
+                    console.log("Adding rows to table");
+                    await addTableRows(tableRows);
+                    await new Promise(resolve => setTimeout(resolve, 2000)); // Wait for rows to be added
+                }
 
                 let filledCount = 0;
                 let failedFields = [];
@@ -239,10 +256,10 @@ chrome.runtime.onMessage.addListener(function(request, sender, sendResponse) {
                 }
                 
                 // Initial attempt
-                for (const [id, value] of Object.entries(request.data)) {
+                for (const {id, value, type} of actions) {
                     await new Promise(resolve => setTimeout(resolve, 200));
-                    if (!(await setFieldValue(id, value))) {
-                        failedFields.push([id, value]);
+                    if (!(await setFieldValue(id, value, type))) {
+                        failedFields.push([id, value, type]);
                     } else {
                         filledCount++;
                     }
@@ -253,9 +270,9 @@ chrome.runtime.onMessage.addListener(function(request, sender, sendResponse) {
                     console.log(`Retrying ${failedFields.length} failed fields...`);
                     await new Promise(resolve => setTimeout(resolve, 1000));
                     
-                    for (const [id, value] of failedFields) {
+                    for (const [id, value, type] of failedFields) {
                         await new Promise(resolve => setTimeout(resolve, 300));
-                        if (await setFieldValue(id, value)) {
+                        if (await setFieldValue(id, value, type)) {
                             filledCount++;
                             const index = failedFields.findIndex(field => field[0] === id);
                             failedFields.splice(index, 1);
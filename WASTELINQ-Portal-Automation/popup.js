@@ -2,6 +2,9 @@ const PROFILE_URL = "https://hzz3uvi5jgjnsomqchehpupqim0iizju.lambda-url.us-east
 const MAPPING_URL = "https://gf6fbx4vhdd5lcq4qmfmvexazi0qgiwp.lambda-url.us-east-2.on.aws/";
 let profileData = null;
 let mappedData = null;
+// Whether to ask the mapping lambda for a fill plan; cleared when the backend answers with the
+// plain element id -> value mapping instead, so later fills stop asking for one
+let requestFillPlan = true;
 
 // Function to ensure content script is injected
 async function ensureContentScriptInjected(tabId) {
@@ -54,25 +57,18 @@ document.getElementById('fillButton').addEventListener('click', async () => {
         return;
     }
 
-    const requestData = {
-        targetPortal: "tradebe",
-        ...profileData  
-    };
-
     try {
         showStatus("Mapping data...", "loading");
 
-        const mappingResponse = await fetch(MAPPING_URL, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(requestData)
-        });
-
+        const mappingResponse = await fetchMapping(requestFillPlan);
         if (!mappingResponse.ok) {
             throw new Error(`Mapping error! status: ${mappingResponse.status}`);
         }
+        if (requestFillPlan && mappingResponse.headers.get('X-Fill-Plan') !== 'compiled') {
+            // The backend sent the plain mapping: it has no form definition for this portal
+            // ("unavailable"), or predates fill plans and sends no X-Fill-Plan header
+            requestFillPlan = false;
+        }
 
         mappedData = await mappingResponse.json();
 
@@ -123,6 +119,23 @@ document.getElementById('fillButton').addEventListener('click', async () => {
     }
 });
 
+// Posts the profile to the mapping lambda, asking for a fill plan when fillPlan is set
+function fetchMapping(fillPlan) {
+    const requestData = {
+        targetPortal: "tradebe",
+        ...(fillPlan ? { fillPlan: true } : {}),
+        ...profileData  
+    };
+
+    return fetch(MAPPING_URL, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(requestData)
+    });
+}
+
 function showError(message) {
     const status = document.getElementById('status');
     status.className = 'error';
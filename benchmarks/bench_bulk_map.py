@@ -0,0 +1,64 @@
+"""
+Measures bulk_map_profiles throughput against the number of worker processes on a
+synthetic NDJSON export, and checks every run writes the same output as one worker.
+
+Usage:
+    python benchmarks/bench_bulk_map.py --profiles 20000 --workers 1 2 4 8
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'portal-automation-tradebe'))
+
+from bulk_map_profiles import bulk_map  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'WASTELINQ-Portal-Automation', 'sample_data',
+                      'sample_pulled_data.json')
+
+
+def build_export(count, seed):
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        profile = dict(sample)
+        profile['Profile_Number'] = str(i)
+        profile['PCpH'] = rng.choice(['≤ 2', '> 5 to ≤ 10', 'Custom', 'N/A'])
+        profile['pc_ph_radio_plus_option'] = f'{rng.uniform(0, 14):.1f}'
+        profile['PCPViscosity'] = rng.choice(['', '101-500', '>500', '1000'])
+        lines.append(json.dumps(profile) + '\n')
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--chunk-size', type=int, default=256)
+    args = parser.parse_args()
+
+    lines = build_export(args.profiles, seed=0)
+    print(f'{args.profiles} profiles, {os.cpu_count()} CPUs')
+    baseline_output = None
+    baseline_rate = None
+    for workers in sorted(set(args.workers)):
+        out = io.StringIO()
+        start = time.perf_counter()
+        count, failed = bulk_map(iter(lines), out, 'tradebe', 'ndjson', workers, args.chunk_size)
+        rate = count / (time.perf_counter() - start)
+        if baseline_output is None:
+            baseline_output, baseline_rate = out.getvalue(), rate
+        elif out.getvalue() != baseline_output:
+            sys.exit(f'Output with {workers} workers differs from {min(args.workers)} worker(s)')
+        print(f'workers: {workers:3d}  {rate:9.0f} profiles/s  scaling: {rate / baseline_rate:5.2f}x  '
+              f'failed: {failed}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Measures the DOT Information fields of the Tradebe mapper (UN/NA code, constituents, RQ,
+special permit flag and number) with the shipping description parsed once per profile,
+against the original methods, which each re-parse ShippingAndPackagingUSDOTComment and
+rescan the special permit fields. Runs on typical descriptions and on pathological ones:
+long comments, unclosed parentheses and long comma lists. Exits non-zero if the two
+disagree on any input.
+
+Usage:
+    python benchmarks/bench_dot_shipping.py --sizes 1000 10000 50000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'portal-automation-tradebe'))
+
+from dot_shipping import DOT_SHIPPING_FIELDS  # noqa: E402
+from tradebe_mapper import TradebeProfileMapper  # noqa: E402
+
+DOT_METHODS = ['_extract_un_na_code', '_extract_constituents', '_extract_rq_info', '_has_dot_special_permit',
+               '_extract_special_permit_number']
+
+TYPICAL = [
+    'UN1993, Waste Flammable liquid, n.o.s. (Acetone, Xylene), 3, PG II',
+    'RQ, UN3082, Environmentally hazardous substance, liquid, n.o.s. (Lead), 9, PG III, D008',
+    'Non-Regulated Material',
+    'UN1263, Waste Paint related material, 3, PG II, DOT-SP 12345',
+    'RQ (Methylene chloride), NA3077, Hazardous waste, solid, n.o.s., 9, PG III, D001, D018',
+]
+
+
+def pathological(size):
+    """Descriptions of about size characters that stress each parser"""
+    return {
+        'long comment': 'Waste Flammable liquid, n.o.s. ' * (size // 32) + '(Acetone, Xylene)',
+        'unclosed (': 'UN1993 ' + '(' * size,
+        'unclosed ( per word': 'RQ ' + '(Acetone ' * (size // 9),
+        'unclosed ( across lines': '(Acetone\n' * (size // 9) + '(Xylene)',
+        'long RQ list': 'RQ Lead, ' + 'D008, (Cadmium), ' * (size // 17),
+        'many SP': 'SP ' * (size // 3) + 'DOT-SP 12345',
+    }
+
+
+class RescanningTradebeMapper(TradebeProfileMapper):
+    """The mapper with the original DOT Information methods, which each parse the description"""
+
+    def _extract_un_na_code(self, data):
+        shipping_desc = data.get("ShippingAndPackagingUSDOTComment", "")
+        if not shipping_desc:
+            return ""
+        shipping_desc = shipping_desc.upper()
+        if "NON-REGULATED" in shipping_desc or "NONREGULATED" in shipping_desc:
+            return "NON-REGULATED MATERIAL"
+        if "NONRCRA / NONDOT" in shipping_desc or "NON RCRA / NON DOT" in shipping_desc:
+            return "NON RCRA REGULATED, NON DOT REGULATED"
+        matches = re.findall(r'(UN\d{4}|NA\d{4})', shipping_desc)
+        return matches[0] if matches else ""
+
+    def _extract_constituents(self, data):
+        shipping_desc = data.get("ShippingAndPackagingUSDOTComment", "")
+        if not shipping_desc:
+            return ""
+        matches = re.findall(r'\((.*?)\)', shipping_desc)
+        if matches:
+            constituents = matches[0].strip()
+            return ', '.join(part.strip() for part in constituents.split(','))
+
+    def _extract_rq_info(self, data):
+        shipping_comment = data.get("ShippingAndPackagingUSDOTComment", "")
+        if not shipping_comment:
+            return ""
+        if shipping_comment.upper().startswith("RQ"):
+            rq_info = []
+            for part in [p.strip() for p in shipping_comment.split(",")]:
+                part = part.upper()
+                if part.startswith("RQ"):
+                    substance = part.replace("RQ", "").strip()
+                    if substance:
+                        rq_info.append(substance)
+                elif part.startswith("D") and len(part) == 4 and part[1:].isdigit():
+                    rq_info.append(part)
+                elif "(" in part and ")" in part:
+                    chemicals = part[part.find("(")+1:part.find(")")].split(",")
+                    rq_info.extend([chem.strip() for chem in chemicals])
+            if rq_info:
+                return f"RQ {', '.join(rq_info)}"
+        return ""
+
+    def _has_dot_special_permit(self, data):
+        for field in DOT_SHIPPING_FIELDS:
+            value = str(data.get(field, "")).upper()
+            if any(pattern in value for pattern in ["DOT-SP", "SP-", "SPECIAL PERMIT", "SP "]):
+                return "Y"
+        return "N"
+
+    def _extract_special_permit_number(self, data):
+        if self._has_dot_special_permit(data) == "N":
+            return ""
+        for field in DOT_SHIPPING_FIELDS:
+            value = str(data.get(field, "")).upper()
+            for pattern in [r"DOT-SP[- ]?(\d+)", r"SP[- ]?(\d+)", r"SPECIAL PERMIT[- #]?(\d+)"]:
+                match = re.search(pattern, value)
+                if match:
+                    return match.group(1)
+        return ""
+
+
+def map_dot_fields(mapper, data):
+    """The DOT Information fields of data, parsing once per profile as map_profile does"""
+    try:
+        return [getattr(mapper, name)(data) for name in DOT_METHODS]
+    finally:
+        mapper._shipping_description = None
+
+
+def time_per_profile(mapper, profiles, min_time=0.2):
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for data in profiles:
+            map_dot_fields(mapper, data)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / (runs * len(profiles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help='lengths of the pathological descriptions in characters')
+    args = parser.parse_args()
+
+    original = RescanningTradebeMapper()
+    parsed = TradebeProfileMapper()
+    cases = [('typical', [{"ShippingAndPackagingUSDOTComment": comment,
+                           "fddDOTNotesSpecialPermits": None, "TransportationRequirement": "None"}
+                          for comment in TYPICAL])]
+    for size in args.sizes:
+        cases += [(f'{name} ({size})', [{"ShippingAndPackagingUSDOTComment": comment}])
+                  for name, comment in pathological(size).items()]
+
+    mismatches = 0
+    print(f'{"description":<34} {"original":>12} {"parsed once":>12} {"speedup":>9}')
+    for name, profiles in cases:
+        for data in profiles:
+            if map_dot_fields(original, data) != map_dot_fields(parsed, data):
+                mismatches += 1
+                print(f'MISMATCH {name}: {map_dot_fields(original, data)} != {map_dot_fields(parsed, data)}')
+        original_time = time_per_profile(original, profiles)
+        parsed_time = time_per_profile(parsed, profiles)
+        print(f'{name:<34} {original_time * 1e6:>9.1f} us {parsed_time * 1e6:>9.1f} us '
+              f'{original_time / parsed_time:>8.1f}x')
+
+    if mismatches:
+        print(f'{mismatches} mismatches')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares filling the Tradebe form from the flat element id -> value mapping with filling
+it from a fill plan, on sample_data/sample_pulled_data.json with 0 to --chemicals
+chemical composition rows. Counts the UI actions content.js takes and the fixed waits it
+sleeps through (200 ms per field, 750 ms per table row added, 3.5 s after adding rows),
+and times compiling the plan.
+
+Usage:
+    python benchmarks/bench_fill_plan.py --chemicals 3 --repeat 2000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'portal-automation-tradebe'))
+
+from fill_plan import compile_fill_plan  # noqa: E402
+from portal_schema import get_portal_schema  # noqa: E402
+from tradebe_mapper import TradebeProfileMapper  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'WASTELINQ-Portal-Automation', 'sample_data',
+                      'sample_pulled_data.json')
+
+# content.js waits
+FIELD_WAIT = 0.2
+ROW_WAIT = 0.75
+ROWS_ADDED_WAIT = 1.5 + 2.0
+FLAT_TABLE_ROWS = 10
+
+
+def fixed_wait(fields, table_rows):
+    return fields * FIELD_WAIT + (table_rows * ROW_WAIT + ROWS_ADDED_WAIT if table_rows else 0)
+
+
+def with_chemicals(profile, count):
+    profile = dict(profile)
+    profile['ChemicalComposition'] = [{'ChemicalPhysicalComposion': f'Chemical {i}', 'CAS': f'{100 + i}-00-0',
+                                       'Min': '1', 'Max': '10'} for i in range(count)]
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chemicals', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    mapper = TradebeProfileMapper()
+    schema = get_portal_schema(mapper.form_definition)
+
+    print(f'{"chemicals":>9} {"flat actions":>13} {"flat wait":>10} {"plan actions":>13} {"plan wait":>10} '
+          f'{"compile":>10}')
+    for count in range(args.chemicals + 1):
+        with contextlib.redirect_stdout(io.StringIO()):
+            mapping, _ = schema.apply(mapper.map_profile(with_chemicals(sample, count)))
+        plan = compile_fill_plan(schema, mapping, mapper.count_table_rows(mapping))
+        if plan['tableRows'] != count:
+            print(f'WARNING: {plan["tableRows"]} table rows for {count} chemicals')
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            compile_fill_plan(schema, mapping, mapper.count_table_rows(mapping))
+        compile_time = (time.perf_counter() - start) / args.repeat
+
+        flat_actions = len(mapping) + FLAT_TABLE_ROWS
+        plan_actions = len(plan['actions']) + plan['tableRows']
+        print(f'{count:>9} {flat_actions:>13} {fixed_wait(len(mapping), FLAT_TABLE_ROWS):>8.1f} s '
+              f'{plan_actions:>13} {fixed_wait(len(plan["actions"]), plan["tableRows"]):>8.1f} s '
+              f'{compile_time * 1e6:>7.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Measures the cold start cost of the mapper registry. Each run is a fresh interpreter that
+imports lambda_function and then maps sample_data/sample_pulled_data.json twice through
+MapperFactory, timing:
+
+    import          importing lambda_function (mappers are imported lazily)
+    first request   get_mapper + map_profile on the first request of the container
+    warm request    the same on the next request, with the mapper already cached
+
+once with mappers built on first use and once with WARM_MAPPERS set, so the mapper is built
+during the import (the Lambda init phase). An "eager" row imports every registered mapper
+module along with the factory, as the factory did before mappers were loaded lazily, and
+builds a new mapper per request.
+
+Usage:
+    python benchmarks/bench_mapper_registry.py --runs 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda-functions',
+                          'portal-automation-tradebe')
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'WASTELINQ-Portal-Automation',
+                      'sample_data', 'sample_pulled_data.json')
+
+CHILD = r"""
+import contextlib, io, json, sys, time
+sys.path.insert(0, sys.argv[1])
+with open(sys.argv[2]) as f:
+    data = json.load(f)
+eager = sys.argv[3] == 'eager'
+
+with contextlib.redirect_stdout(io.StringIO()):
+    start = time.perf_counter()
+    import lambda_function
+    from mapper_factory import MapperFactory
+    if eager:
+        from importlib import import_module
+        for path in MapperFactory._mapper_paths.values():
+            import_module(path.partition(':')[0])
+    imported = time.perf_counter()
+
+    def request():
+        if eager:
+            module_name, _, class_name = MapperFactory._mapper_paths['tradebe'].partition(':')
+            mapper = getattr(sys.modules[module_name], class_name)()
+        else:
+            mapper = MapperFactory.get_mapper('tradebe')
+        mapper.map_profile(data)
+
+    request()
+    first = time.perf_counter()
+    request()
+    warm = time.perf_counter()
+
+print(json.dumps({'import': imported - start, 'first': first - imported, 'warm': warm - first}))
+"""
+
+
+def run(mode, env):
+    output = subprocess.run([sys.executable, '-c', CHILD, LAMBDA_DIR, SAMPLE, mode], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='fresh interpreters per configuration')
+    args = parser.parse_args()
+
+    env = dict(os.environ, MAPPING_CACHE='none')
+    env.pop('WARM_MAPPERS', None)
+    configurations = [
+        ('eager', 'eager', env),
+        ('lazy', 'lazy', env),
+        ('lazy, WARM_MAPPERS', 'lazy', dict(env, WARM_MAPPERS='tradebe')),
+    ]
+
+    print(f'{"configuration":<20} {"import ms":>10} {"first request ms":>17} {"warm request ms":>16} '
+          f'{"import + first ms":>18}')
+    for name, mode, configuration_env in configurations:
+        timings = [run(mode, configuration_env) for _ in range(args.runs)]
+        imported = statistics.median(t['import'] for t in timings) * 1000
+        first = statistics.median(t['first'] for t in timings) * 1000
+        warm = statistics.median(t['warm'] for t in timings) * 1000
+        total = statistics.median(t['import'] + t['first'] for t in timings) * 1000
+        print(f'{name:<20} {imported:>10.1f} {first:>17.2f} {warm:>16.3f} {total:>18.1f}')
+
+
+if __name__ == '__main__':
+    main()
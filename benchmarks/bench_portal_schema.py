@@ -0,0 +1,66 @@
+"""
+Measures validating Tradebe mappings against portals/Tradebe_v2.json: compiling the
+schema from the definition once, against the cached schema, and applying it to the
+mapping of sample_data/sample_pulled_data.json, next to the time to map the profile.
+Prints the violations found in the sample mapping.
+
+Usage:
+    python benchmarks/bench_portal_schema.py --repeat 2000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'portal-automation-tradebe'))
+
+from portal_definitions import load_portal_definition  # noqa: E402
+from portal_schema import PortalSchema, get_portal_schema  # noqa: E402
+from tradebe_mapper import TradebeProfileMapper  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'WASTELINQ-Portal-Automation', 'sample_data',
+                      'sample_pulled_data.json')
+
+
+def time_per_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    mapper = TradebeProfileMapper()
+    with contextlib.redirect_stdout(io.StringIO()):
+        mapping = mapper.map_profile(profile)
+        map_time = time_per_call(lambda: mapper.map_profile(profile), args.repeat)
+
+    definition = load_portal_definition(mapper.form_definition)
+    compile_time = time_per_call(lambda: PortalSchema(definition), args.repeat)
+    cached_time = time_per_call(lambda: get_portal_schema(mapper.form_definition), args.repeat)
+    schema = get_portal_schema(mapper.form_definition)
+    apply_time = time_per_call(lambda: schema.apply(mapping), args.repeat)
+
+    print(f'compile schema ({len(schema.fields)} fields): {compile_time * 1e6:8.1f} us')
+    print(f'cached schema lookup:             {cached_time * 1e6:8.1f} us')
+    print(f'map_profile:                      {map_time * 1e6:8.1f} us')
+    print(f'apply schema ({len(mapping)} values):        {apply_time * 1e6:8.1f} us')
+
+    coerced, violations = schema.apply(mapping)
+    print(f'violations: {dict(violations) or "none"}')
+    for element_id, value in mapping.items():
+        if coerced.get(element_id, '<dropped>') != value:
+            print(f'  {element_id}: {value!r} -> {coerced.get(element_id, "<dropped>")!r}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Compares ad-hoc and server-side prepared execution of the sequential profile queries of the
+rds-query lambda on one reused connection, against a local Postgres with the `network` schema.
+
+Usage:
+    DB_PROXY=localhost DB_USER=... DB_PASSWORD=... DB_NAME=... DB_PORT=5432 \
+        python benchmarks/bench_prepared_statements.py 114513 114445 --repeat 200
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'rds-query'))
+
+import lambda_function  # noqa: E402
+
+
+def run(conn, ids, repeat, prepared):
+    lambda_function.USE_PREPARED_STATEMENTS = prepared
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()), conn.cursor() as cur:
+        for _ in range(repeat):
+            for id in ids:
+                start = time.perf_counter()
+                lambda_function.get_profile_data(cur, lambda_function.SCHEMA, id)
+                timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('ids', nargs='+', help='customer profile ids to fetch')
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    conn = lambda_function.get_db_connection()
+    conn.autocommit = True
+    try:
+        # Warm up the server caches so both variants see the same buffer state
+        run(conn, args.ids, 1, prepared=False)
+        adhoc = run(conn, args.ids, args.repeat, prepared=False)
+        prepared = run(conn, args.ids, args.repeat, prepared=True)
+        print(f'statements prepared on the connection: {len(conn.prepared_statements)}')
+    finally:
+        conn.close()
+
+    for name, timings in (('ad-hoc', adhoc), ('prepared', prepared)):
+        print(f'{name:<9} mean: {statistics.mean(timings) * 1000:7.3f} ms  '
+              f'median: {statistics.median(timings) * 1000:7.3f} ms per profile')
+    print(f'speedup: {statistics.mean(adhoc) / statistics.mean(prepared):.2f}x')
+
+
+if __name__ == '__main__':
+    main()
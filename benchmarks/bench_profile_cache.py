@@ -0,0 +1,100 @@
+"""
+Times the rds-query profile cache against a local Postgres that has the `network` schema
+restored: the version probe on its own (the xmin probe the lambda uses against hashing the
+rows' text), and a served profile on a cache hit, on a miss, and with the cache off.
+
+A hit costs one probe round trip; a miss costs the probe plus the fetch, encode and put.
+
+Usage:
+    DB_PROXY=localhost DB_USER=... DB_PASSWORD=... DB_NAME=... DB_PORT=5432 \
+        python benchmarks/bench_profile_cache.py 114513 114445 --repeat 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'rds-query'))
+
+import lambda_function  # noqa: E402
+from profile_cache import MemoryProfileCache  # noqa: E402
+
+
+def build_row_hash_query(schema):
+    # The probe before xmin: hashes the text of every row of the profile
+    table_hashes = [
+        f"""coalesce((SELECT md5(string_agg(t::text, ',' ORDER BY t::text)) FROM {schema}.{table} t WHERE t."{id_param}" = %s), '-')"""
+        for table, id_param, _ in lambda_function.PROFILE_TABLES
+    ]
+    return f"SELECT md5(concat_ws('|', {', '.join(table_hashes)}))"
+
+
+def probe(query):
+    def run_probe(cur, schema, id):
+        lambda_function.execute_profile_query(cur, query, (id,) * len(lambda_function.PROFILE_TABLES))
+        return cur.fetchone()[0]
+    return run_probe
+
+
+def serve(cache_for_run):
+    def run_serve(cur, schema, id):
+        lambda_function._profile_cache = cache_for_run()
+        return lambda_function.get_profile_body(cur, schema, id, None, lambda_function.get_cache_key(schema, id, None))
+    return run_serve
+
+
+def run(work, conn, ids, repeat):
+    timings = {id: [] for id in ids}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for id in ids:
+                cur = conn.cursor()
+                start = time.perf_counter()
+                work(cur, lambda_function.SCHEMA, id)
+                timings[id].append(time.perf_counter() - start)
+                cur.close()
+    return timings
+
+
+def report(name, timings):
+    for id, id_timings in timings.items():
+        id_timings = sorted(id_timings)
+        p95 = id_timings[int(len(id_timings) * 0.95) - 1] if len(id_timings) > 1 else id_timings[0]
+        print(f'{name:<14} id {id:<8} mean: {statistics.mean(id_timings) * 1000:7.2f} ms  p95: {p95 * 1000:7.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('ids', nargs='+', help='customer profile ids to fetch')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    schema = lambda_function.SCHEMA
+    warm_cache = MemoryProfileCache(len(args.ids))
+    conn = lambda_function.get_db_connection()
+    try:
+        row_hash = run(probe(build_row_hash_query(schema)), conn, args.ids, args.repeat)
+        xmin = run(probe(lambda_function.build_profile_version_query(schema)), conn, args.ids, args.repeat)
+        off = run(serve(lambda: None), conn, args.ids, args.repeat)
+        miss = run(serve(lambda: MemoryProfileCache(len(args.ids))), conn, args.ids, args.repeat)
+        run(serve(lambda: warm_cache), conn, args.ids, 1)
+        hit = run(serve(lambda: warm_cache), conn, args.ids, args.repeat)
+    finally:
+        conn.close()
+        lambda_function._profile_cache = None
+
+    report('probe row hash', row_hash)
+    report('probe xmin', xmin)
+    report('cache off', off)
+    report('cache miss', miss)
+    report('cache hit', hit)
+    for id in args.ids:
+        print(f'id {id}: probe speedup {statistics.mean(row_hash[id]) / statistics.mean(xmin[id]):.2f}x, '
+              f'hit vs miss {statistics.mean(miss[id]) / statistics.mean(hit[id]):.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Measures response encoding throughput of the rds-query lambda on representative profile rows:
+psycopg2's default Decimal/datetime values serialized with json.dumps(default=str), against
+the JSON-ready typecasters plus encode_json (orjson when installed).
+
+Usage:
+    python benchmarks/bench_profile_encoding.py --rows 20000
+"""
+import argparse
+import datetime
+import decimal
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'rds-query'))
+
+import profile_json  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'WASTELINQ-Portal-Automation', 'sample_data',
+                      'sample_pulled_data.json')
+
+# Numeric and timestamp columns as Postgres sends them as text
+NUMERIC_COLUMNS = {
+    'PCSpecificGravity': '1.05', 'PCPTotalOrganicCarbonValue': '12.5', 'PCPBoilingPointValue': '212',
+    'ShippingAndPackagingVolume': '55', 'TransBulkLiquid_Gallons': '5000.00', 'TransBulkSolid_TonYardShipment': '20',
+    'PCPPhysicalStateLiquidPercent': '100', 'TransContainer_PortToteTankSize': '330', 'Total Halogens %': '0.25',
+}
+TIMESTAMP_COLUMNS = {
+    'created_at': '2024-11-04 15:32:10.123456+00', 'updated_at': '2024-12-01 09:00:00+00', 'Analysis_Date': '2024-10-30',
+}
+
+
+def build_rows(count):
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    legacy_rows = []
+    raw_rows = []
+    for i in range(count):
+        legacy = dict(base, id=base['id'] + i)
+        raw = dict(legacy)
+        for column, text in NUMERIC_COLUMNS.items():
+            legacy[column] = decimal.Decimal(text)
+            raw[column] = text
+        legacy['created_at'] = datetime.datetime(2024, 11, 4, 15, 32, 10, 123456, tzinfo=datetime.timezone.utc)
+        legacy['updated_at'] = datetime.datetime(2024, 12, 1, 9, 0, tzinfo=datetime.timezone.utc)
+        legacy['Analysis_Date'] = datetime.date(2024, 10, 30)
+        raw.update(TIMESTAMP_COLUMNS)
+        legacy_rows.append(legacy)
+        raw_rows.append(raw)
+    return legacy_rows, raw_rows
+
+
+def typecast(raw):
+    """What the registered typecasters do while psycopg2 reads the row"""
+    row = dict(raw)
+    for column in NUMERIC_COLUMNS:
+        row[column] = profile_json.cast_numeric(row[column], None)
+    for column in ('created_at', 'updated_at'):
+        row[column] = profile_json.cast_timestamp(row[column], None)
+    return row
+
+
+def measure(name, rows, encode):
+    start = time.perf_counter()
+    size = 0
+    for row in rows:
+        size += len(encode(row))
+    elapsed = time.perf_counter() - start
+    print(f'{name:<28} {len(rows) / elapsed:10.0f} rows/s  {size / len(rows):7.0f} bytes/row')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    legacy_rows, raw_rows = build_rows(args.rows)
+    print(f"encoder: {'orjson' if profile_json.orjson else 'json'}")
+    legacy = measure('json.dumps(default=str)', legacy_rows, lambda row: json.dumps(row, default=str))
+    typed = measure('typecasters + encode_json', raw_rows, lambda row: profile_json.encode_json(typecast(row)))
+    print(f'speedup: {legacy / typed:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Compares the sequential, single-statement and parallel per-table profile queries of the
+rds-query lambda against a local Postgres that has the `network` schema restored.
+
+Parallel mode reads all but the first table on the lambda's worker connections, so only the
+statements on the calling connection are counted as round trips; the others overlap with it.
+
+Usage:
+    DB_PROXY=localhost DB_USER=... DB_PASSWORD=... DB_NAME=... DB_PORT=5432 \
+        python benchmarks/bench_profile_query.py 114513 114445 --repeat 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'rds-query'))
+
+import psycopg2.extensions  # noqa: E402
+import lambda_function  # noqa: E402
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    """Cursor that counts the statements it sends, i.e. the round trips to the server"""
+    executed = 0
+
+    def execute(self, query, vars=None):
+        CountingCursor.executed += 1
+        return super().execute(query, vars)
+
+
+def run(fetch, conn, ids, repeat):
+    timings = []
+    CountingCursor.executed = 0
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for id in ids:
+                cur = conn.cursor(cursor_factory=CountingCursor)
+                start = time.perf_counter()
+                results[id] = fetch(cur, lambda_function.SCHEMA, id)
+                timings.append(time.perf_counter() - start)
+                cur.close()
+    round_trips = CountingCursor.executed / (repeat * len(ids))
+    return results, timings, round_trips
+
+
+def report(name, timings, round_trips):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+    print(f'{name:<12} round trips/profile: {round_trips:>4.1f}  '
+          f'mean: {statistics.mean(timings) * 1000:7.2f} ms  p95: {p95 * 1000:7.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('ids', nargs='+', help='customer profile ids to fetch')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    conn = lambda_function.get_db_connection()
+    try:
+        sequential, seq_timings, seq_trips = run(lambda_function.get_profile_data, conn, args.ids, args.repeat)
+        joined, join_timings, join_trips = run(lambda_function.get_profile_data_joined, conn, args.ids, args.repeat)
+        # Opens the worker connections once so connection setup is not part of the timings
+        run(lambda_function.get_profile_data_parallel, conn, args.ids, 1)
+        parallel, par_timings, par_trips = run(lambda_function.get_profile_data_parallel, conn, args.ids, args.repeat)
+    finally:
+        conn.close()
+        for slot in list(lambda_function._connections):
+            lambda_function.reset_connection(slot)
+
+    for name, results in (('joined', joined), ('parallel', parallel)):
+        mismatched = [id for id in args.ids if sequential[id] != results[id]]
+        if mismatched:
+            print(f'WARNING: {name} result differs from sequential for ids {mismatched}')
+
+    report('sequential', seq_timings, seq_trips)
+    report('join', join_timings, join_trips)
+    report('parallel', par_timings, par_trips)
+    print(f'join speedup:     {statistics.mean(seq_timings) / statistics.mean(join_timings):.2f}x')
+    print(f'parallel speedup: {statistics.mean(seq_timings) / statistics.mean(par_timings):.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Measures TradebeProfileMapper.remap on single-field edits against mapping the edited
+profile from scratch, and checks the rules' declared reads: every rule is run on
+sample_data/sample_pulled_data.json and on randomly edited copies with the profile reads
+traced, and every remap must equal the full mapping. Exits non-zero on any mismatch.
+
+Usage:
+    python benchmarks/bench_remap.py --edits 2000
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'portal-automation-tradebe'))
+
+from field_rules import WHOLE_PROFILE  # noqa: E402
+from tradebe_mapper import TradebeProfileMapper  # noqa: E402
+from tradebe_profile import TradebeProfile  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'WASTELINQ-Portal-Automation', 'sample_data',
+                      'sample_pulled_data.json')
+
+# Values that switch rules onto their other branches
+EDIT_VALUES = ['', None, True, False, 'Yes', 'No', 'Custom', 'Actual', '12.5', '73', '> 10,000', 'Wastewater',
+               'Bulk Liquid', 'hydrofluoric acid', 'contains F006 sludge', 'PFAS', 'methylene chloride',
+               'UN1993, Waste Flammable liquid, n.o.s. (Acetone, Xylene), 3, PG II, DOT-SP 12345',
+               'RQ, UN3082, (Lead), 9, PG III', '55 G', '300', '101-500', 'hexavalent chromium, EDTA']
+
+
+class TracingProfile(dict):
+    """A profile dict that records the keys read from it, and WHOLE_PROFILE when it is iterated"""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reads = set()
+
+    def get(self, key, default=None):
+        self.reads.add(key)
+        return super().get(key, default)
+
+    def __getitem__(self, key):
+        self.reads.add(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self.reads.add(key)
+        return super().__contains__(key)
+
+    def items(self):
+        self.reads.add(WHOLE_PROFILE)
+        return super().items()
+
+    def values(self):
+        self.reads.add(WHOLE_PROFILE)
+        return super().values()
+
+    def keys(self):
+        self.reads.add(WHOLE_PROFILE)
+        return super().keys()
+
+    def __iter__(self):
+        self.reads.add(WHOLE_PROFILE)
+        return super().__iter__()
+
+
+class TracingFieldSet(frozenset):
+    """A TradebeProfile flag or answer set that records the fields tested for membership"""
+
+    def __new__(cls, fields, reads):
+        self = super().__new__(cls, fields)
+        self.reads = reads
+        return self
+
+    def __contains__(self, field):
+        self.reads.add(field)
+        return super().__contains__(field)
+
+
+class TracingTradebeProfile(TradebeProfile):
+    """
+    The typed profile of a TracingProfile. The reads of the coercion pass are dropped, and
+    the fields behind each attribute a rule reads are recorded instead.
+    """
+
+    def __init__(self, traced):
+        super().__init__(traced)
+        traced.reads.clear()
+        self.flags = TracingFieldSet(self.flags, traced.reads)
+        self.yes_answers = TracingFieldSet(self.yes_answers, traced.reads)
+
+    def __getattribute__(self, name):
+        fields = TradebeProfile.attribute_fields.get(name)
+        if fields:
+            object.__getattribute__(self, 'data').reads.update(fields)
+        return object.__getattribute__(self, name)
+
+
+def edit(profile, fields, rng):
+    edited = copy.deepcopy(profile)
+    changed = rng.sample(fields, rng.choice([1, 1, 1, 2]))
+    for field in changed:
+        if field == 'ChemicalComposition':
+            rows = [{'ChemicalPhysicalComposion': rng.choice(['Acetone', 'Nitric acid', 'Water ']), 'CAS': '67-64-1',
+                     'Min': '1', 'Max': '5'} for _ in range(rng.randint(0, 3))]
+            edited[field] = rows
+        elif rng.random() < 0.1:
+            edited.pop(field, None)
+        else:
+            edited[field] = rng.choice(EDIT_VALUES)
+    return changed, edited
+
+
+def check_declared_reads(mapper, profiles):
+    undeclared = {}
+    for element_id, rule in mapper.field_rules:
+        declared = mapper.field_dependencies[element_id]
+        for profile in profiles:
+            traced = TracingProfile(profile)
+            try:
+                mapper._profile = TracingTradebeProfile(traced)
+                rule(mapper, traced)
+            except Exception:
+                # Values the rule rejects still show what it read up to that point
+                pass
+            finally:
+                mapper._profile = None
+            if WHOLE_PROFILE not in declared and not traced.reads <= declared:
+                undeclared.setdefault(element_id, set()).update(traced.reads - declared)
+    return undeclared
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--edits', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    mapper = TradebeProfileMapper()
+    rng = random.Random(args.seed)
+    read_fields = {field for reads in mapper.field_dependencies.values() for field in reads} - {WHOLE_PROFILE}
+    fields = sorted(set(sample) | read_fields | {'ChemicalComposition'})
+    edits = [edit(sample, fields, rng) for _ in range(args.edits)]
+
+    failures = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        undeclared = check_declared_reads(mapper, [sample] + [edited for _, edited in edits[:200]])
+        failures += [f'{element_id} reads undeclared fields {sorted(reads)}' for element_id, reads in undeclared.items()]
+
+        previous = mapper.map_profile(sample)
+        full_time = remap_time = 0.0
+        mapped = 0
+        for changed, edited in edits:
+            start = time.perf_counter()
+            try:
+                full = mapper.map_profile(edited)
+            except Exception:
+                # An edit the mapper rejects, e.g. a boolean viscosity
+                continue
+            full_time += time.perf_counter() - start
+            mapped += 1
+            start = time.perf_counter()
+            remapped = mapper.remap(previous, changed, edited)
+            remap_time += time.perf_counter() - start
+            if list(remapped.items()) != list(full.items()):
+                failures.append(f'remap after editing {changed} differs from map_profile')
+
+    print(f'{mapped} edits of {len(fields)} fields  map_profile: {full_time / mapped * 1e6:8.1f} us  '
+          f'remap: {remap_time / mapped * 1e6:8.1f} us  speedup: {full_time / remap_time:5.2f}x')
+    if failures:
+        sys.exit('\n'.join(failures[:20]))
+
+
+if __name__ == '__main__':
+    main()
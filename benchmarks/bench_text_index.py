@@ -0,0 +1,92 @@
+"""
+Measures the Tradebe mapper's per-profile time with term searches answered by the
+per-profile text index, against the original scan that re-stringifies every value on
+each search. Runs on sample_data/sample_pulled_data.json and on synthetic profiles with
+extra free-text fields.
+
+Usage:
+    python benchmarks/bench_text_index.py --repeat 200 --extra-fields 500
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'portal-automation-tradebe'))
+
+from hazard_terms import HAZARD_TERMS  # noqa: E402
+from tradebe_mapper import TradebeProfileMapper  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'WASTELINQ-Portal-Automation', 'sample_data',
+                      'sample_pulled_data.json')
+
+# HAZARD_TERMS categories the mapper searches for in every profile field
+PROFILE_WIDE_CATEGORIES = ('metal_powder', 'hydrofluoric_acid', 'nitric_acid', 'isocyanates', 'nitrocellulose',
+                           'sharps', 'no_sharps', 'f006_f019', 'chlorinated_constituents', 'pfas')
+
+FILLER = ('Spent solvent rinse from parts washer, mixed with shop rags and absorbent. '
+          'Contains trace xylene and mineral spirits; no free liquids after solidification. ')
+
+
+class ScanningTradebeMapper(TradebeProfileMapper):
+    """The mapper with the original term search, which scans the whole profile per call"""
+
+    def _search_all_fields_for_terms(self, data, terms):
+        for value in data.values():
+            if value is not None:
+                str_value = str(value).lower()
+                if any(term.lower() in str_value for term in terms):
+                    return True
+        return False
+
+    def _get_hazard_categories(self, data):
+        return {category for category in PROFILE_WIDE_CATEGORIES
+                if self._search_all_fields_for_terms(data, HAZARD_TERMS[category])}
+
+
+def build_large_profile(base, extra_fields):
+    profile = dict(base)
+    for i in range(extra_fields):
+        profile[f'Note_{i}'] = FILLER * (1 + i % 4)
+    return profile
+
+
+def measure(mapper, profile, repeat):
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = mapper.map_profile(profile)
+            timings.append(time.perf_counter() - start)
+    return result, statistics.mean(timings)
+
+
+def compare(name, profile, repeat):
+    scanned, scan_time = measure(ScanningTradebeMapper(), profile, repeat)
+    indexed, index_time = measure(TradebeProfileMapper(), profile, repeat)
+    if scanned != indexed:
+        print(f'WARNING: indexed mapping differs from the scanning mapping on {name}')
+    print(f'{name:<24} {len(profile):5d} fields  scan: {scan_time * 1000:8.3f} ms  '
+          f'index: {index_time * 1000:8.3f} ms  speedup: {scan_time / index_time:5.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--extra-fields', type=int, default=500,
+                        help='free-text fields added to the synthetic large profile')
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+
+    compare('sample profile', sample, args.repeat)
+    compare('synthetic large profile', build_large_profile(sample, args.extra_fields), max(1, args.repeat // 10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Times the Tradebe mapper's RCRA waste code extraction against the original per-code scan
+(with its update()-per-character bug fixed) on the sample profile and on a synthetic profile
+with many free-text fields. Correctness is covered by tests/test_waste_codes.py.
+
+Usage:
+    python benchmarks/bench_waste_codes.py --repeat 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda-functions', 'portal-automation-tradebe'))
+
+from profile_text_index import ProfileTextIndex  # noqa: E402
+from waste_codes import RCRA_WASTE_CODES, find_waste_codes, get_declared_waste_codes  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'WASTELINQ-Portal-Automation', 'sample_data',
+                      'sample_pulled_data.json')
+
+def scan_waste_codes(data):
+    """The original extraction: one full-profile search per known code, then the declared codes"""
+    waste_codes = set()
+    for code in sorted(RCRA_WASTE_CODES):
+        if any(code.lower() in str(value).lower() for value in data.values() if value is not None):
+            waste_codes.add(code)
+    for field, code in (('WCHazardousIgnitable', 'D001'), ('WCHazardousCorrosive', 'D002'),
+                        ('WCHazardousReactive', 'D003'), ('WCHazardousToxic', 'D004')):
+        if data.get(field) == 'Yes':
+            waste_codes.add(code)
+    for letter, flag_field, list_field in (('F', 'WCHazardousF', 'hazardouswastenof'),
+                                           ('K', 'WCHazardousK', 'hazardouswastenoK'),
+                                           ('P', 'WCHazardousP', 'hazardouswastenoP'),
+                                           ('U', 'WCHazardousU', 'hazardouswastenoU')):
+        if data.get(flag_field) == 'Yes' and data.get(list_field):
+            codes = [code.strip().upper() for code in data[list_field].split(',') if code.strip()]
+            waste_codes.update(code for code in codes
+                               if code.startswith(letter) and len(code) == 4 and code[1:].isdigit())
+    if data.get('StateWasteCode'):
+        waste_codes.add(data['StateWasteCode'])
+    return sorted(waste_codes)
+
+
+def build_large_profile(base, extra_fields):
+    profile = dict(base)
+    for i in range(extra_fields):
+        profile[f'Note_{i}'] = 'rinsate from tank cleaning, mixed solvents and sludge; see lab report 2023-114. ' * 3
+    profile['Note_0'] += ' F005'
+    return profile
+
+
+def measure(name, data, repeat):
+    scan_timings = []
+    extract_timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scan_waste_codes(data)
+        scan_timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        # Includes building the text index, which map_profile otherwise shares with the other term searches
+        find_waste_codes(ProfileTextIndex(data).corpus) | get_declared_waste_codes(data)
+        extract_timings.append(time.perf_counter() - start)
+    scan = statistics.mean(scan_timings)
+    extract = statistics.mean(extract_timings)
+    print(f'{name:<24} {len(data):5d} fields  scan: {scan * 1000:8.3f} ms  '
+          f'extractor: {extract * 1000:7.3f} ms  speedup: {scan / extract:6.1f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--extra-fields', type=int, default=500)
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    measure('sample profile', sample, args.repeat)
+    measure('synthetic large profile', build_large_profile(sample, args.extra_fields), max(1, args.repeat // 10))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,82 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator, NamedTuple, Optional
+
+class ProfileMappingResult(NamedTuple):
+    """One item of a map_profiles batch: the mapped profile, or the error that stopped it"""
+    index: int
+    mapping: Optional[Dict[str, Any]]
+    error: Optional[str]
 
 class BaseProfileMapper(ABC):
     """
     Abstract base class that defines the interface for all waste profile mappers.
     Each portal-specific mapper must implement these methods.
     """
+    # portals/*.json definition of the target form, which mapped values are validated against
+    form_definition: Optional[str] = None
     
     @abstractmethod
-    def map_profile(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def map_profile(self, data: Dict[str, Any], fields: Optional[Iterable[str]] = None,
+                    sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Maps source portal data to target portal format.
         
         Args:
             data: Dictionary containing the source portal's profile data
+            fields: Target element ids to map; with sections, only the selected elements
+                are mapped. Unknown ids raise SelectionError, and ids of the form that the
+                mapper has no rule for are left out of the result
+            sections: Target form sections whose elements are mapped; unknown or
+                ambiguous names raise SelectionError
+            
+        Returns:
+            Dictionary containing mapped data in target portal's format
+        """
+        pass
+
+    def map_profiles(self, profiles: Iterable[Dict[str, Any]]) -> Iterator[ProfileMappingResult]:
+        """
+        Maps many profiles, yielding one result per profile in input order as soon as it is mapped.
+        A profile that fails to map is reported in its result's error and the batch continues.
+        
+        Args:
+            profiles: Iterable of source portal profile dicts, consumed lazily
+            
+        Returns:
+            Iterator of ProfileMappingResult
+        """
+        for index, data in enumerate(profiles):
+            try:
+                yield ProfileMappingResult(index, self.map_profile(data), None)
+            except Exception as e:
+                yield ProfileMappingResult(index, None, f"{type(e).__name__}: {e}")
+
+    def count_table_rows(self, mapping: Dict[str, Any]) -> int:
+        """
+        Rows of the target form's table that a mapping fills, which the form has to be given
+        before it is filled. Forms without a table need none.
+        
+        Args:
+            mapping: Dictionary returned by map_profile
+            
+        Returns:
+            Number of table rows
+        """
+        return 0
+
+    def remap(self, previous_output: Dict[str, Any], changed_fields: Iterable[str],
+              data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Maps a profile that was edited since previous_output was mapped from it. Mappers that
+        know which fields each output reads recompute only what changed; by default the whole
+        profile is mapped again.
+        
+        Args:
+            previous_output: The mapping of the profile before the edit
+            changed_fields: Source fields whose values changed, were added or were removed
+            data: The edited profile
             
         Returns:
             Dictionary containing mapped data in target portal's format
         """
-        pass
\ No newline at end of file
+        return self.map_profile(data)
\ No newline at end of file
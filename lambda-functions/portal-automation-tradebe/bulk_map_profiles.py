@@ -0,0 +1,176 @@
+"""
+Maps a profile export (NDJSON, e.g. from rds-query's export_profiles.py, or CSV) to portal
+field mappings, writing one NDJSON line per input profile in input order:
+
+    {"index": 0, "mapping": {...}, "error": null}
+
+The input is read as a stream and sent to a pool of worker processes in chunks; at most
+--max-in-flight chunks are queued or being mapped at a time, so memory stays bounded
+however large the export is. Workers parse and encode their own chunks, leaving the main
+process only to read and write lines.
+
+In CSV input, NULL cells are read as null and True/False cells as booleans, like the
+values rds-query returns.
+
+Usage:
+    python bulk_map_profiles.py profiles.ndjson mapped.ndjson
+    python bulk_map_profiles.py generator_physicalandchemicalproperties.csv - --workers 4 > mapped.ndjson
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from mapper_factory import MapperFactory
+
+DEFAULT_CHUNK_SIZE = 256
+PROGRESS_EVERY = 10000
+
+CSV_VALUES = {"NULL": None, "True": True, "False": False}
+
+# Worker process state, set by init_worker
+_mapper = None
+_csv_columns = None
+
+def read_chunks(lines, input_format: str, chunk_size: int) -> Tuple[Optional[List[str]], Iterator[List[Any]]]:
+    """
+    Returns the CSV header (None for NDJSON) and an iterator of chunks of raw records: NDJSON
+    lines, or CSV rows as lists of cells. Records are parsed into profiles by the workers.
+    """
+    if input_format == "csv":
+        records = csv.reader(lines)
+        columns = next(records, [])
+    else:
+        records = (line for line in lines if line.strip())
+        columns = None
+
+    def chunks():
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    return columns, chunks()
+
+def parse_record(record: Any) -> Dict[str, Any]:
+    if _csv_columns is None:
+        return json.loads(record)
+    return {column: CSV_VALUES.get(cell, cell) for column, cell in zip(_csv_columns, record)}
+
+def init_worker(portal: str, csv_columns: Optional[List[str]]):
+    global _mapper, _csv_columns
+    _mapper = MapperFactory.get_mapper(portal)
+    _csv_columns = csv_columns
+
+def map_chunk(start_index: int, records: List[Any]) -> Tuple[str, int]:
+    """Maps a chunk of raw records, returning their NDJSON output lines and the number that failed"""
+    profiles = []
+    errors = {}
+    for i, record in enumerate(records):
+        try:
+            profiles.append(parse_record(record))
+        except ValueError as e:
+            # A placeholder keeps the output aligned with the input
+            profiles.append(None)
+            errors[i] = f"{type(e).__name__}: {e}"
+
+    lines = []
+    failed = 0
+    # The mappers log each batch with print; bulk_map reports progress itself
+    with contextlib.redirect_stdout(io.StringIO()):
+        for result in _mapper.map_profiles(profiles):
+            error = errors.get(result.index, result.error)
+            failed += error is not None
+            lines.append(json.dumps({"index": start_index + result.index,
+                                     "mapping": None if error else result.mapping, "error": error}))
+    return "\n".join(lines) + "\n", failed
+
+def bulk_map(lines, out, portal: str, input_format: str, workers: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+             max_in_flight: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Maps every profile in lines and writes the results to out in input order. With workers
+    of 1 or less the profiles are mapped in this process. Returns (profiles, failed).
+    """
+    csv_columns, chunks = read_chunks(lines, input_format, chunk_size)
+    count = 0
+    written = 0
+    failed = 0
+    start = time.perf_counter()
+
+    def write(output: str, chunk_failed: int, chunk_count: int):
+        nonlocal written, failed
+        out.write(output)
+        failed += chunk_failed
+        if (written + chunk_count) // PROGRESS_EVERY > written // PROGRESS_EVERY:
+            elapsed = time.perf_counter() - start
+            print(f'{written + chunk_count} profiles mapped, {(written + chunk_count) / elapsed:.0f} profiles/s',
+                  file=sys.stderr)
+        written += chunk_count
+
+    if workers <= 1:
+        init_worker(portal, csv_columns)
+        for chunk in chunks:
+            write(*map_chunk(count, chunk), len(chunk))
+            count += len(chunk)
+        return count, failed
+
+    max_in_flight = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(portal, csv_columns)) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            if len(in_flight) >= max_in_flight:
+                # Chunks are written in submission order, so the output follows the input
+                future, chunk_count = in_flight.popleft()
+                write(*future.result(), chunk_count)
+            in_flight.append((executor.submit(map_chunk, count, chunk), len(chunk)))
+            count += len(chunk)
+        while in_flight:
+            future, chunk_count = in_flight.popleft()
+            write(*future.result(), chunk_count)
+    return count, failed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help="NDJSON or CSV profile export, or '-' for stdin")
+    parser.add_argument('output', help="NDJSON file to write, or '-' for stdout")
+    parser.add_argument('--portal', default='tradebe', help='target portal mapper')
+    parser.add_argument('--format', choices=['ndjson', 'csv'],
+                        help='input format; by default .csv files are CSV and everything else NDJSON')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='mapping processes; 1 maps in this process')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='profiles sent to a worker at a time')
+    parser.add_argument('--max-in-flight', type=int, help='chunks queued or being mapped at a time (default 2 per worker)')
+    args = parser.parse_args()
+
+    input_format = args.format or ('csv' if args.input.lower().endswith('.csv') else 'ndjson')
+    # newline='' lets the csv module handle line breaks inside quoted cells
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8-sig', newline='')
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        count, failed = bulk_map(source, out, args.portal, input_format, args.workers, args.chunk_size,
+                                 args.max_in_flight)
+    finally:
+        out.flush()
+        if out is not sys.stdout:
+            out.close()
+        if source is not sys.stdin:
+            source.close()
+
+    elapsed = time.perf_counter() - start
+    print(f'Mapped {count} profiles ({failed} failed) in {elapsed:.1f}s with {max(args.workers, 1)} worker(s), '
+          f'{count / elapsed if elapsed else 0:.0f} profiles/s', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import re
+from typing import Dict, Any, List, Optional
+
+SHIPPING_DESCRIPTION_FIELD = "ShippingAndPackagingUSDOTComment"
+# Fields DotShippingDescription reads, all of which may mention a DOT special permit
+DOT_SHIPPING_FIELDS = [
+    SHIPPING_DESCRIPTION_FIELD,
+    "fddDOTNotesSpecialPermits",
+    "TransportationRequirement"
+]
+
+UN_NA_PATTERN = re.compile(r'(UN\d{4}|NA\d{4})')
+INNERMOST_PARENTHESES = re.compile(r'\([^()\n]*\)')
+SPECIAL_PERMIT_MARKERS = [
+    "DOT-SP",
+    "SP-",
+    "SPECIAL PERMIT",
+    "SP ",  # Space after SP to avoid matching other abbreviations
+]
+# Tried in order on each field, the first match giving the permit number
+SPECIAL_PERMIT_NUMBER_PATTERNS = [
+    re.compile(r"DOT-SP[- ]?(\d+)"),  # Matches DOT-SP12345 or DOT-SP 12345
+    re.compile(r"SP[- ]?(\d+)"),      # Matches SP12345 or SP 12345
+    re.compile(r"SPECIAL PERMIT[- #]?(\d+)")  # Matches SPECIAL PERMIT 12345
+]
+
+def find_first_parenthesized(text: str) -> Optional[str]:
+    """
+    Text between the first "(" and the ")" after it on the same line, like
+    re.search(r'\((.*?)\)', text), without rescanning the rest of the text for every "("
+    that is never closed.
+    """
+    # Each "(" is only scanned up to the next parenthesis or line break, so this is linear
+    match = INNERMOST_PARENTHESES.search(text)
+    if match is None:
+        return None
+    # The first match opens at the first "(" since the last ")" or line break before it
+    segment_start = max(text.rfind(")", 0, match.start()), text.rfind("\n", 0, match.start())) + 1
+    return text[text.find("(", segment_start) + 1:match.end() - 1]
+
+def find_special_permit_number(values: List[str]) -> str:
+    """The number of the first special permit pattern to match, trying each value in turn"""
+    for value in values:
+        for pattern in SPECIAL_PERMIT_NUMBER_PATTERNS:
+            match = pattern.search(value)
+            if match:
+                return match.group(1)
+    return ""
+
+class DotShippingDescription:
+    """
+    The parts of a profile's US DOT shipping description (ShippingAndPackagingUSDOTComment)
+    and its special permit, parsed once per profile for the DOT Information fields.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        description = data.get(SHIPPING_DESCRIPTION_FIELD, "")
+        if description and not isinstance(description, str):
+            raise TypeError(f"{SHIPPING_DESCRIPTION_FIELD} must be a string, not {type(description).__name__}")
+        description = description or ""
+        upper = description.upper()
+
+        # "NON-REGULATED MATERIAL", "NON RCRA REGULATED, NON DOT REGULATED" or "" if regulated
+        self.non_regulated_status = ""
+        if "NON-REGULATED" in upper or "NONREGULATED" in upper:
+            self.non_regulated_status = "NON-REGULATED MATERIAL"
+        elif "NONRCRA / NONDOT" in upper or "NON RCRA / NON DOT" in upper:
+            self.non_regulated_status = "NON RCRA REGULATED, NON DOT REGULATED"
+        match = UN_NA_PATTERN.search(upper)
+        self.un_na_number = match.group(1) if match else ""
+
+        # The first parenthesized list, None if a description has none
+        self.constituents = None if description else ""
+        if description:
+            constituents = find_first_parenthesized(description)
+            if constituents is not None:
+                self.constituents = ', '.join(part.strip() for part in constituents.strip().split(','))
+
+        # Reportable quantity substances and D-codes of a description starting with RQ, in order
+        self.rq_entries: List[str] = []
+        self.rq_substances: List[str] = []
+        self.d_codes: List[str] = []
+        if upper.startswith("RQ"):
+            for part in description.split(","):
+                part = part.strip().upper()
+                if part.startswith("RQ"):
+                    # The substance named in the RQ marker itself
+                    substance = part.replace("RQ", "").strip()
+                    if substance:
+                        self.rq_entries.append(substance)
+                        self.rq_substances.append(substance)
+                elif part.startswith("D") and len(part) == 4 and part[1:].isdigit():
+                    self.rq_entries.append(part)
+                    self.d_codes.append(part)
+                elif "(" in part and ")" in part:
+                    chemical = part[part.find("(")+1:part.find(")")].strip()
+                    self.rq_entries.append(chemical)
+                    self.rq_substances.append(chemical)
+
+        permit_values = [str(data.get(field, "")).upper() for field in DOT_SHIPPING_FIELDS]
+        self.has_special_permit = any(marker in value for value in permit_values for marker in SPECIAL_PERMIT_MARKERS)
+        self.special_permit_number = find_special_permit_number(permit_values) if self.has_special_permit else ""
+
+    @property
+    def un_na_code(self) -> str:
+        """The non-regulated status, or else the first UN/NA number"""
+        return self.non_regulated_status or self.un_na_number
+
+    @property
+    def regulated(self) -> bool:
+        return not self.non_regulated_status
+
+    @property
+    def rq_info(self) -> str:
+        """The Reportable Quantity field: "RQ " and the RQ substances and D-codes, or "" """
+        return f"RQ {', '.join(self.rq_entries)}" if self.rq_entries else ""
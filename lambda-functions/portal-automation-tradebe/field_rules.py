@@ -0,0 +1,219 @@
+import re
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# A compiled rule takes the mapper and the profile and returns the value of one portal element
+CompiledRule = Callable[[Any, Dict[str, Any]], Any]
+
+# A compiled range bin: (upper bound, upper bound included, label)
+Bin = Tuple[float, bool, Any]
+
+# Portal field rules are declared as {element id: rule spec}, where a rule spec is a dict
+# whose "kind" selects one of the compilers below:
+#
+#   value        the profile field as is, or "default" when it is missing; "substitutions"
+#                replaces particular values
+#   yes_no       "Y" if the field equals "equals" (default "Yes"), or if the optional mapper
+#                method "or_check" returns True, else "N"
+#   lookup       "table"[field value], or "default" when the value is not in the table
+#   regex_extract  first match of "pattern" in the field, "no_match" when there is none and
+#                "missing" when the field is empty
+#   range_bin    the label of a categorical field from "standard"; when the field equals
+#                "custom_trigger", the numeric "custom_field" is binned: each bin is
+#                [upper bound, "<" or "<=", label], checked in order, then "above"
+#   term_flag    "Y" if a HAZARD_TERMS category occurs anywhere in the profile, else "N"
+#   const        a fixed value
+#   method       the result of a mapper method called with the profile
+#
+# Rules that call mapper methods (method, and yes_no with "or_check") declare the profile
+# fields the methods read in "reads", or WHOLE_PROFILE when they scan every field. The
+# other kinds read the fields named in their spec, and term_flag the whole profile.
+
+# "reads" of a rule that depends on every field of the profile, like the hazard term scans
+WHOLE_PROFILE = "*"
+
+def compile_bins(bins: List[List[Any]]) -> List[Bin]:
+    """Compiles [upper bound, "<" or "<=", label] bin specs, which must be in ascending order"""
+    return [(float(upper), comparison == "<=", label) for upper, comparison, label in bins]
+
+def find_bin(number: float, bins: List[Bin]) -> Optional[Any]:
+    """Label of the first bin that number falls below, or None above the last bin (and for NaN)"""
+    for upper, inclusive, label in bins:
+        if number < upper or (inclusive and number == upper):
+            return label
+    return None
+
+def _compile_value(spec: Dict[str, Any]) -> CompiledRule:
+    field = spec["field"]
+    substitutions = spec.get("substitutions")
+    if "default" not in spec:
+        return lambda mapper, data: data.get(field)
+    default = spec["default"]
+    if not substitutions:
+        return lambda mapper, data: data.get(field, default)
+
+    def rule(mapper, data):
+        value = data.get(field, default)
+        return substitutions.get(value, value) if isinstance(value, str) else value
+    return rule
+
+def _compile_yes_no(spec: Dict[str, Any]) -> CompiledRule:
+    field = spec["field"]
+    equals = spec.get("equals", "Yes")
+    or_check = spec.get("or_check")
+    if or_check is None:
+        return lambda mapper, data: "Y" if data.get(field) == equals else "N"
+    return lambda mapper, data: "Y" if data.get(field) == equals or getattr(mapper, or_check)(data) else "N"
+
+def _compile_lookup(spec: Dict[str, Any]) -> CompiledRule:
+    field = spec["field"]
+    table = spec["table"]
+    default = spec.get("default", "")
+    return lambda mapper, data: table.get(data.get(field, ""), default)
+
+def _compile_regex_extract(spec: Dict[str, Any]) -> CompiledRule:
+    field = spec["field"]
+    pattern = re.compile(spec["pattern"])
+    missing = spec.get("missing", "")
+    no_match = spec.get("no_match", "")
+
+    def rule(mapper, data):
+        value = data.get(field, "")
+        if not value:
+            return missing
+        match = pattern.search(value)
+        return match.group(0) if match else no_match
+    return rule
+
+def _compile_range_bin(spec: Dict[str, Any]) -> CompiledRule:
+    field = spec["field"]
+    standard = spec["standard"]
+    custom_trigger = spec["custom_trigger"]
+    custom_field = spec["custom_field"]
+    missing = spec["missing"]
+    bins = compile_bins(spec["bins"])
+    above = spec["above"]
+
+    def rule(mapper, data):
+        value = data.get(field)
+        if not value or value == "N/A":
+            return missing
+        if value in standard:
+            return standard[value]
+
+        custom_value = data.get(custom_field)
+        if value != custom_trigger or not custom_value:
+            return missing
+        try:
+            number = float(custom_value)
+        except (ValueError, TypeError):
+            return missing
+        label = find_bin(number, bins)
+        return above if label is None else label
+    return rule
+
+def _compile_term_flag(spec: Dict[str, Any]) -> CompiledRule:
+    category = spec["category"]
+    return lambda mapper, data: "Y" if category in mapper._get_hazard_categories(data) else "N"
+
+def _compile_const(spec: Dict[str, Any]) -> CompiledRule:
+    value = spec["value"]
+    if isinstance(value, list):
+        # A new list per profile, so callers can change one mapping without touching the others
+        return lambda mapper, data: list(value)
+    return lambda mapper, data: value
+
+def _compile_method(spec: Dict[str, Any]) -> CompiledRule:
+    name = spec["name"]
+    return lambda mapper, data: getattr(mapper, name)(data)
+
+RULE_COMPILERS = {
+    "value": _compile_value,
+    "yes_no": _compile_yes_no,
+    "lookup": _compile_lookup,
+    "regex_extract": _compile_regex_extract,
+    "range_bin": _compile_range_bin,
+    "term_flag": _compile_term_flag,
+    "const": _compile_const,
+    "method": _compile_method,
+}
+
+def get_rule_reads(element_id: str, spec: Dict[str, Any]) -> FrozenSet[str]:
+    """The profile fields a rule spec reads, or {WHOLE_PROFILE}"""
+    kind = spec.get("kind")
+    if kind == "term_flag":
+        return frozenset([WHOLE_PROFILE])
+    if (kind == "method" or spec.get("or_check")) and "reads" not in spec:
+        raise ValueError(f"Rule for {element_id} calls a mapper method but does not declare its reads")
+
+    declared = spec.get("reads", [])
+    if declared == WHOLE_PROFILE:
+        return frozenset([WHOLE_PROFILE])
+    return frozenset([spec[key] for key in ("field", "custom_field") if key in spec] + list(declared))
+
+def build_dependency_graph(rules: Dict[str, Dict[str, Any]]) -> Dict[str, FrozenSet[str]]:
+    """Element id -> the profile fields its rule reads, for a {element id: rule spec} table"""
+    return {element_id: get_rule_reads(element_id, spec) for element_id, spec in rules.items()}
+
+def find_affected_elements(graph: Dict[str, FrozenSet[str]], changed_fields: Iterable[str]) -> List[str]:
+    """Element ids, in graph order, whose rules read any of changed_fields"""
+    changed = set(changed_fields)
+    if not changed:
+        return []
+    return [element_id for element_id, reads in graph.items()
+            if WHOLE_PROFILE in reads or not reads.isdisjoint(changed)]
+
+def compile_field_rules(rules: Dict[str, Dict[str, Any]]) -> List[Tuple[str, CompiledRule]]:
+    """Compiles a {element id: rule spec} table into (element id, rule) pairs, in spec order"""
+    compiled = []
+    for element_id, spec in rules.items():
+        compiler = RULE_COMPILERS.get(spec.get("kind"))
+        if compiler is None:
+            raise ValueError(f"Unknown rule kind for {element_id}: {spec.get('kind')}")
+        compiled.append((element_id, compiler(spec)))
+    return compiled
+
+def assign_rule_sections(rules: Dict[str, Dict[str, Any]], section_ids: Dict[str, List[str]]) -> Dict[str, str]:
+    """
+    Form section of each element of a {element id: rule spec} table in form order, from the
+    portal definition's {section: [element id, ...]}. Elements the definition does not list,
+    like fields revealed by another answer, belong to the section of the element before them.
+    """
+    sections = {element_id: section for section, element_ids in section_ids.items() for element_id in element_ids}
+    assigned = {}
+    section = None
+    for element_id in rules:
+        section = sections.get(element_id, section)
+        assigned[element_id] = section
+    return assigned
+
+class SelectionError(ValueError):
+    """A requested form section or element id that does not select any form elements"""
+
+def find_section(name: str, sections: Iterable[str]) -> str:
+    """The section called name, or else the only one whose name starts with it, ignoring case"""
+    sections = list(sections)
+    if name in sections:
+        return name
+    matches = [section for section in sections if section.lower().startswith(name.lower())]
+    if not matches:
+        raise SelectionError(f"Unknown form section: {name}. Sections: {', '.join(sections)}")
+    if len(matches) > 1:
+        raise SelectionError(f"Ambiguous form section: {name} matches {', '.join(matches)}")
+    return matches[0]
+
+def select_elements(rule_sections: Dict[str, str], known_ids: FrozenSet[str], fields: Iterable[str],
+                    sections: Iterable[str]) -> List[str]:
+    """
+    Element ids, in rule order, of the rules for the requested element ids and for every
+    element of the requested sections (names as resolved by find_section). Raises
+    SelectionError for an element id that is not in known_ids; known elements without a rule
+    are left out.
+    """
+    fields = list(fields)
+    unknown = [element_id for element_id in fields if element_id not in known_ids]
+    if unknown:
+        raise SelectionError(f"Unknown field ids: {', '.join(unknown)}")
+    requested = set(fields)
+    sections = set(sections)
+    return [element_id for element_id, section in rule_sections.items()
+            if element_id in requested or section in sections]
@@ -0,0 +1,57 @@
+"""
+Fill plans: a mapped profile compiled into the actions content.js takes to fill the form,
+so it neither waits on fields that need no input nor probes each element for its type.
+
+A plan lists one action per value to enter, in the order of the fields on the form, with
+the field's control type from the form definition (see portal_schema):
+
+    {"actions": [{"id": ..., "type": "text" | "textarea" | "select" | "multi_select" | None,
+                  "value": ...}, ...],
+     "tableRows": rows to add to the form's table, "omitted": values left out}
+
+Empty values and values the form already holds are left out. Elements the definition does
+not list, like the chemical composition rows, have no type and follow the listed element
+they follow in the mapping.
+"""
+from typing import Any, Dict
+from portal_schema import PortalSchema
+
+# Definition field type -> the control content.js fills; numbers are typed like text
+CONTROL_TYPES = {
+    "text": "text",
+    "number": "text",
+    "textarea": "textarea",
+    "select": "select",
+    "multi_select": "multi_select",
+    "multiselect": "multi_select",
+}
+
+def compile_fill_plan(schema: PortalSchema, mapping: Dict[str, Any], table_rows: int) -> Dict[str, Any]:
+    """
+    Compiles a mapped profile into a fill plan.
+
+    Args:
+        schema: Compiled definition of the target form
+        mapping: Element id -> value, as returned by map_profile
+        table_rows: Rows the mapping fills in the form's table, see count_table_rows
+
+    Returns:
+        The fill plan
+    """
+    planned = []
+    position = -1
+    for sequence, (element_id, value) in enumerate(mapping.items()):
+        field = schema.fields.get(element_id)
+        if field is not None:
+            position = field.position
+        if value is None or value == "" or value == [] or (field is not None and value == field.default):
+            continue
+        planned.append(((position, field is None, sequence), element_id, value, field))
+    planned.sort(key=lambda action: action[0])
+
+    return {
+        "actions": [{"id": element_id, "type": CONTROL_TYPES.get(field.type) if field is not None else None,
+                     "value": value} for _, element_id, value, field in planned],
+        "tableRows": table_rows,
+        "omitted": len(mapping) - len(planned),
+    }
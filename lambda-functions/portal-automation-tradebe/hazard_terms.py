@@ -0,0 +1,84 @@
+from typing import Dict, Iterable, List, Set
+
+# The C automaton of pyahocorasick is used when it is installed; otherwise TermMatcher
+# falls back to one substring search per term.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Term dictionaries of the Tradebe mapper, by category. Terms match case-insensitively
+# anywhere in the searched text.
+HAZARD_TERMS = {
+    # Searched in every profile field
+    "metal_powder": ["metal powder", "metal flake", "metal dust"],
+    "hydrofluoric_acid": ["HYDROFLUORIC ACID"],
+    "nitric_acid": ["NITRIC ACID"],
+    "isocyanates": ["ISOCYANATES", "ISOCYANATE"],
+    "nitrocellulose": ["NITROCELLULOSE"],
+    "sharps": ["sharps"],
+    "no_sharps": ["no sharps"],
+    "f006_f019": ["F006", "F019"],
+    "chlorinated_constituents": [
+        'Aroclor 1242', 'Aroclor 1254', 'Aroclor 1260', 'Aroclor',
+        'Trichloroethylene', 'Tetrachloroethylene', 'Carbon tetrachloride',
+        'Methylene chloride', '1,1,1-Trichloroethane', 'Chlorobenzene',
+        'Dichlorobenzenes', 'Trichlorobenzenes', 'Vinyl chloride',
+        'Chloroform', '1,2-Dichloroethane', 'Pentachlorophenol',
+        'DDT', 'Chlordane', 'Dieldrin', 'Heptachlor', 'PCP',
+    ],
+    "pfas": [
+        'Perfluorooctanoic acid', 'PFOA', 'Perfluorooctane sulfonic acid', 'PFOS',
+        'Perfluorobutane sulfonic acid', 'PFBS', 'Hexafluoropropylene oxide dimer acid',
+        'HFPO-DA', 'GenX', 'Perfluorononanoic acid', 'PFNA', 'Perfluorohexane sulfonic acid',
+        'PFHxS', 'Perfluorodecanoic acid', 'PFDA', 'Perfluorohexanoic acid', 'PFHxA',
+        'Perfluorobutanoic acid', 'PFBA', 'Polyfluorinated alkyl', 'PFAS',
+    ],
+
+    # Searched in the chemical composition
+    "hexachrome": ["hexavalent chromium", "cr(vi)", "cr6+", "hexachrome"],
+    "chelating_agent": ["edta", "chelat", "sequester"],
+    "lachrymator": ["tear gas", "lachrymator", "cs gas", "pepper spray"],
+    "inhalation_hazard": ["toxic by inhalation", "inhalation hazard", "poison by inhalation"],
+    "fuming": ["fuming", "fumes", "oleum"],
+    "dea_regulated": ["controlled substance", "dea regulated", "schedule i", "schedule ii"],
+
+    # Searched in TransportationRequirement
+    "temperature_controlled": ["temperature controlled", "temp control", "refrigerated"],
+}
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over the terms of several categories. scan() walks the text once,
+    whatever the number of terms, and returns the category of every term found in it.
+    """
+
+    def __init__(self, terms_by_category: Dict[str, Iterable[str]]):
+        self._terms: Dict[str, List[str]] = {
+            category: [term.lower() for term in terms] for category, terms in terms_by_category.items()
+        }
+        self._automaton = None
+        if ahocorasick is None:
+            return
+
+        categories_by_term: Dict[str, Set[str]] = {}
+        for category, terms in self._terms.items():
+            for term in terms:
+                categories_by_term.setdefault(term, set()).add(category)
+        self._automaton = ahocorasick.Automaton()
+        for term, categories in categories_by_term.items():
+            self._automaton.add_word(term, frozenset(categories))
+        self._automaton.make_automaton()
+
+    def scan(self, text: str) -> Set[str]:
+        """Categories with at least one term in text, which must already be lowercase"""
+        if self._automaton is None:
+            return {category for category, terms in self._terms.items() if any(term in text for term in terms)}
+
+        found = set()
+        for _, categories in self._automaton.iter(text):
+            found |= categories
+        return found
+
+# Built once per container and shared by every mapper instance
+HAZARD_TERM_MATCHER = TermMatcher(HAZARD_TERMS)
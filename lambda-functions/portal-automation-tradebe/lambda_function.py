@@ -1,12 +1,52 @@
 from typing import Dict, Any, List, Optional, Tuple
 import json
+import os
 import re
 
 from mapper_factory import MapperFactory
+from field_rules import SelectionError
+from fill_plan import compile_fill_plan
+from mapping_cache import create_mapping_cache, decode_entry, encode_entry, get_mapping_cache_key
+from portal_schema import get_portal_schema
 
-def lambda_handler(event, context):
+# Memo cache of mapped responses: 'memory' (an LRU shared by warm invocations), 'sqlite'
+# (a local file at MAPPING_CACHE_PATH) or 'none'. Entries expire after MAPPING_CACHE_TTL seconds.
+MAPPING_CACHE = os.environ.get('MAPPING_CACHE', 'memory')
+MAPPING_CACHE_SIZE = int(os.environ.get('MAPPING_CACHE_SIZE', '512'))
+MAPPING_CACHE_TTL = float(os.environ.get('MAPPING_CACHE_TTL', '3600'))
+MAPPING_CACHE_PATH = os.environ.get('MAPPING_CACHE_PATH', '/tmp/mapping_cache.sqlite3')
+
+# Portals whose mappers are built during the Lambda init phase instead of on their first
+# request, comma separated, or 'all'. By default mappers are built on first use.
+WARM_MAPPERS = os.environ.get('WARM_MAPPERS', '')
+
+# Whether mapped values are checked and coerced against the target form's definition
+# (see portal_schema) before they are returned: 'true' or 'false'
+VALIDATE_MAPPINGS = os.environ.get('VALIDATE_MAPPINGS', 'true').lower() == 'true'
+
+if WARM_MAPPERS:
+    MapperFactory.warmup(None if WARM_MAPPERS == 'all' else
+                         [portal.strip() for portal in WARM_MAPPERS.split(',') if portal.strip()])
+
+_mapping_cache = None
+
+def get_mapping_cache():
+    """Creates the mapping cache on first use, so it is kept by warm invocations"""
+    global _mapping_cache
+    if _mapping_cache is None and MAPPING_CACHE != 'none':
+        _mapping_cache = create_mapping_cache(MAPPING_CACHE, MAPPING_CACHE_SIZE, MAPPING_CACHE_TTL, MAPPING_CACHE_PATH)
+    return _mapping_cache
+
+def get_form_schema(mapper):
+    """
+    The compiled schema of the mapper's target form, or None if it has no form definition.
+    A definition that cannot be read fails the request rather than skipping validation.
+    """
+    if not mapper.form_definition:
+        return None
+    return get_portal_schema(mapper.form_definition)
 
-    print(event['body'])
+def lambda_handler(event, context):
     try:
         # Get data from the event
         data = json.loads(event['body']) if isinstance(event.get('body'), str) else event.get('body', {})
@@ -16,22 +56,82 @@ def lambda_handler(event, context):
         print(f'Target portal: {target_portal}')
         if not target_portal:
             raise ValueError("Target portal not specified in request")
+
+        # Optional target element ids and form sections to map instead of the whole form, and
+        # whether to answer with a fill plan (see fill_plan) instead of the element id -> value dict
+        selection = {key: data.pop(key) for key in ('targetFields', 'targetSections', 'fillPlan') if key in data}
             
-        # Get appropriate mapper from factory
-        mapper = MapperFactory.get_mapper(target_portal)
-        
-        # Map the profile data
-        mapped_data = mapper.map_profile(data)
+        # Serve a repeated request from the cache; the key is taken before mapping touches the data
+        cache = get_mapping_cache()
+        cache_key = get_mapping_cache_key(target_portal, data, selection) if cache is not None else None
+        entry = cache.get(cache_key) if cache is not None else None
+        cache_status = 'off' if cache is None else 'hit' if entry is not None else 'miss'
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Mapping-Cache': cache_status
+        }
+
+        if entry is not None:
+            # A hit reports the same mapping headers as the request that stored it
+            body, mapping_headers = decode_entry(entry)
+            headers.update(mapping_headers)
+        else:
+            # Headers describing the mapping, stored with the body
+            mapping_headers = {}
+
+            # Get appropriate mapper from factory
+            mapper = MapperFactory.get_mapper(target_portal)
+
+            # Map the profile data
+            target_fields = selection.get('targetFields')
+            mapped_data = mapper.map_profile(data, target_fields, selection.get('targetSections'))
+
+            # Requested elements of the form that the mapper has no rule for
+            if target_fields is not None:
+                target_fields = [target_fields] if isinstance(target_fields, str) else target_fields
+                mapping_headers['X-Unmapped-Fields'] = json.dumps(
+                    [element_id for element_id in target_fields if element_id not in mapped_data])
+
+            # Fit the values to the form
+            schema = get_form_schema(mapper)
+            if schema is not None and VALIDATE_MAPPINGS:
+                mapped_data, violations = schema.apply(mapped_data)
+                if violations:
+                    print(f'Schema violations: {dict(violations)}')
+                mapping_headers['X-Schema-Violations'] = json.dumps(violations, sort_keys=True)
+
+            # A mapper without a form definition answers a fill plan request with the plain mapping
+            if selection.get('fillPlan'):
+                if schema is None:
+                    mapping_headers['X-Fill-Plan'] = 'unavailable'
+                else:
+                    mapped_data = compile_fill_plan(schema, mapped_data, mapper.count_table_rows(mapped_data))
+                    mapping_headers['X-Fill-Plan'] = 'compiled'
+            body = json.dumps(mapped_data)
+            headers.update(mapping_headers)
+            if cache is not None:
+                cache.put(cache_key, encode_entry(body, mapping_headers))
 
         # Return successful response with mapped data
         return {
             'statusCode': 200,
-            'body': json.dumps(mapped_data),
+            'body': body,
+            'headers': headers
+        }
+        
+    except SelectionError as e:
+        # The requested fields or sections do not select form elements
+        print(e)
+        return {
+            'statusCode': 400,
+            'body': json.dumps({
+                'error': str(e)
+            }),
             'headers': {
                 'Content-Type': 'application/json'
             }
         }
-        
+
     except Exception as e:
         # Return error response
         print(e)
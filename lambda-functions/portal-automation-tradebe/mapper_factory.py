@@ -1,19 +1,105 @@
-from typing import Dict, Type
+from importlib import import_module
+from typing import Dict, Iterable, List, Optional
+import os
+import threading
 from base_mapper import BaseProfileMapper
-from tradebe_mapper import TradebeProfileMapper
+
+# Entry point group through which installed packages can provide mappers, as
+# portal name = "module:ClassName"
+ENTRY_POINT_GROUP = "wastelinq.portal_mappers"
 
 class MapperFactory:
-    """Factory class for creating mappers"""
-    
-    _mappers: Dict[str, Type[BaseProfileMapper]] = {
-        "tradebe": TradebeProfileMapper
+    """
+    Registry of portal mappers. Mapper modules are imported when their portal is first
+    requested, and each mapper is built once and shared by every later request, so adding
+    portals does not slow down cold starts of the ones in use.
+
+    Mappers keep per-profile state while mapping, so a shared instance must not map two
+    profiles at once; a Lambda container runs one invocation at a time.
+    """
+
+    # Portal -> "module:ClassName" of its mapper. More can be added with register, the
+    # PORTAL_MAPPERS environment variable ("portal=module:ClassName,...") or entry points.
+    _mapper_paths: Dict[str, str] = {
+        "tradebe": "tradebe_mapper:TradebeProfileMapper"
     }
-    
+
+    _mappers: Dict[str, BaseProfileMapper] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, portal: str, path: str):
+        """Registers the mapper class at path ("module:ClassName") for portal"""
+        cls._mapper_paths[portal.lower()] = path
+        cls._mappers.pop(portal.lower(), None)
+
     @classmethod
     def get_mapper(cls, portal: str) -> BaseProfileMapper:
         """Get mapper instance for specified portal"""
-        mapper_class = cls._mappers.get(portal.lower())
-        if not mapper_class:
+        portal = portal.lower()
+        mapper = cls._mappers.get(portal)
+        if mapper is not None:
+            return mapper
+
+        with cls._lock:
+            mapper = cls._mappers.get(portal)
+            if mapper is None:
+                mapper = cls._load_mapper_class(portal)()
+                cls._mappers[portal] = mapper
+        return mapper
+
+    @classmethod
+    def warmup(cls, portals: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Imports and builds the mappers of portals (by default every registered portal) ahead
+        of the first request, and maps an empty profile through each so lazily built state
+        is ready too. Returns the portals warmed.
+        """
+        portals = list(portals if portals is not None else cls.available_portals())
+        for portal in portals:
+            mapper = cls.get_mapper(portal)
+            try:
+                mapper.map_profile({})
+            except Exception as e:
+                print(f'Warmup mapping for {portal} failed: {e}')
+        return portals
+
+    @classmethod
+    def available_portals(cls) -> List[str]:
+        """Portals with a registered mapper, without importing any of them"""
+        cls._load_environment_paths()
+        portals = set(cls._mapper_paths)
+        portals.update(entry_point.name.lower() for entry_point in cls._entry_points())
+        return sorted(portals)
+
+    @classmethod
+    def _load_mapper_class(cls, portal: str):
+        cls._load_environment_paths()
+        path = cls._mapper_paths.get(portal)
+        if path is None:
+            for entry_point in cls._entry_points():
+                if entry_point.name.lower() == portal:
+                    path = entry_point.value
+                    break
+        if not path:
             raise ValueError(f"No mapper available for portal: {portal}")
-            
-        return mapper_class()
\ No newline at end of file
+
+        module_name, _, class_name = path.partition(":")
+        mapper_class = getattr(import_module(module_name), class_name, None)
+        if not (isinstance(mapper_class, type) and issubclass(mapper_class, BaseProfileMapper)):
+            raise ValueError(f"Mapper for portal {portal} is not a BaseProfileMapper: {path}")
+        return mapper_class
+
+    @staticmethod
+    def _entry_points():
+        # importlib.metadata takes longer to import than the factory itself, so it is only
+        # imported when a portal is not registered here
+        from importlib.metadata import entry_points
+        return entry_points(group=ENTRY_POINT_GROUP)
+
+    @classmethod
+    def _load_environment_paths(cls):
+        for item in os.environ.get("PORTAL_MAPPERS", "").split(","):
+            portal, _, path = item.partition("=")
+            if portal.strip() and path.strip() and portal.strip().lower() not in cls._mapper_paths:
+                cls._mapper_paths[portal.strip().lower()] = path.strip()
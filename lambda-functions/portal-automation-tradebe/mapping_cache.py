@@ -0,0 +1,126 @@
+"""
+Memo cache of mapped portal payloads for the mapping lambda.
+
+Entries are keyed by a hash of the target portal, the mapper version and the canonical
+JSON of the input profile, and hold the serialized response body with the headers that
+describe it (see encode_entry), so a repeated request is answered the same way without
+mapping or encoding the profile again. Entries expire ttl seconds after they are stored.
+
+Backends:
+    memory  an LRU dict in the container, shared by warm invocations
+    sqlite  a SQLite file (by default in the Lambda's /tmp), kept across container restarts
+            when the path is on persistent storage
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Version of the mapping code, part of every cache key, so entries built by an earlier
+# deployment (e.g. in a persistent SQLite cache) are never served after a change. Builds
+# set the MAPPER_VERSION environment variable to their commit; bump the default with any
+# change to mapping output.
+MAPPER_VERSION = os.environ.get("MAPPER_VERSION", "2")
+
+def get_mapping_cache_key(portal: str, data: Dict[str, Any], selection: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Stable hash of a mapping request: the same profile gives the same key whatever its key
+    order. A fields / sections selection (see map_profile) is part of the key.
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    if selection:
+        portal += "\0" + json.dumps(selection, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"{portal.lower()}\0{MAPPER_VERSION}\0{canonical}".encode("utf-8")).hexdigest()
+
+def encode_entry(body: str, headers: Dict[str, str]) -> str:
+    """
+    A cache entry holding a response body and its headers: the headers' JSON on the first
+    line, then the body, so a hit does not parse the body again.
+    """
+    return json.dumps(headers, sort_keys=True) + "\n" + body
+
+def decode_entry(entry: str) -> Tuple[str, Dict[str, str]]:
+    """The (body, headers) stored by encode_entry"""
+    headers, body = entry.split("\n", 1)
+    return body, json.loads(headers)
+
+class MemoryMappingCache:
+    """In-process LRU of at most maxsize response bodies"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored, body = entry
+        if time.time() - stored > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: str, body: str):
+        self._entries[key] = (time.time(), body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteMappingCache:
+    """Response bodies in a local SQLite file, evicting the least recently used above maxsize"""
+
+    def __init__(self, path: str, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS mapping_cache (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                stored REAL NOT NULL,
+                used REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS mapping_cache_used ON mapping_cache (used)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        row = self._db.execute("SELECT body FROM mapping_cache WHERE key = ? AND stored >= ?",
+                               (key, now - self.ttl)).fetchone()
+        if row is None:
+            return None
+        self._db.execute("UPDATE mapping_cache SET used = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, body: str):
+        now = time.time()
+        self._db.execute("INSERT OR REPLACE INTO mapping_cache (key, body, stored, used) VALUES (?, ?, ?, ?)",
+                         (key, body, now, now))
+        self._db.execute("""
+            DELETE FROM mapping_cache WHERE stored < ? OR key IN (
+                SELECT key FROM mapping_cache ORDER BY used DESC LIMIT -1 OFFSET ?
+            )
+        """, (now - self.ttl, self.maxsize))
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM mapping_cache").fetchone()[0]
+
+def create_mapping_cache(backend: str, maxsize: int, ttl: float, path: str):
+    """Returns the cache for a MAPPING_CACHE setting, or None when caching is off"""
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryMappingCache(maxsize, ttl)
+    if backend == "sqlite":
+        return SQLiteMappingCache(path, maxsize, ttl)
+    raise ValueError(f"Unknown mapping cache backend: {backend}")
@@ -0,0 +1,25 @@
+"""
+Portal form definitions, the extension's portals/*.json files: for each form section, the
+fields in form order with their element id, type, options and limits.
+
+Definitions are read from PORTAL_DEFINITIONS_DIR, by default the portals directory deployed
+with the lambda, which holds copies of the extension's definitions the mappers target.
+"""
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List
+
+PORTAL_DEFINITIONS_DIR = os.environ.get(
+    'PORTAL_DEFINITIONS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'portals'))
+
+@lru_cache(maxsize=None)
+def load_portal_definition(filename: str) -> Dict[str, List[Dict[str, Any]]]:
+    """The {section: [field, ...]} definition in filename, read once per process"""
+    with open(os.path.join(PORTAL_DEFINITIONS_DIR, filename), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def get_section_ids(definition: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[str]]:
+    """Element ids of each section's fields, in form order"""
+    return {section: [field["id"] for field in fields] for section, fields in definition.items()}
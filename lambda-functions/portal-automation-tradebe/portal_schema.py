@@ -0,0 +1,116 @@
+"""
+Validation of mapped values against a portal form definition (see portal_definitions),
+compiled once per definition into a lookup by element id.
+
+Applying a schema to a mapping:
+    - drops fields the form has disabled, which content.js cannot fill
+    - truncates text longer than the field's maxlength
+    - replaces select and multi select values by the form's spelling of the option they
+      match ignoring case and spacing, or whose code they are ("W101" for "W101 - ...")
+Values that match no option are kept, as the portal's dropdowns filter on typed text, and
+are only counted. Elements the definition does not list, like the chemical composition
+rows, are passed through unchanged.
+"""
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from portal_definitions import load_portal_definition
+
+SELECT_TYPES = ("select", "multi_select", "multiselect")
+
+# Separates an option's code from its description, as in "W101 - VERY DILUTE SOLUTION"
+OPTION_CODE_SEPARATOR = " - "
+
+def normalize_option(value: str) -> str:
+    """value in one case with runs of spaces collapsed, for matching options"""
+    return " ".join(value.split()).casefold()
+
+class FieldSchema(NamedTuple):
+    """The constraints of one form field that mapped values are checked against"""
+    type: str
+    max_length: Optional[int]
+    disabled: bool
+    # The option values, and normalized option or option code -> the option's value (None
+    # for a code shared by several options); None for fields without options
+    option_values: Optional[FrozenSet[str]]
+    options: Optional[Dict[str, Optional[str]]]
+    # Index of the field in form order, and the value the form starts with, if any
+    position: int
+    default: Any
+
+def compile_field(field: Dict[str, Any], position: int) -> FieldSchema:
+    """FieldSchema of a definition field. The definitions spell the limit maxlength or maxLength"""
+    max_length = field.get("maxlength", field.get("maxLength"))
+    option_values = options = None
+    if field["type"] in SELECT_TYPES and field.get("options"):
+        options = {}
+        values = [option["value"] for option in field["options"]]
+        option_values = frozenset(values)
+        for value in values:
+            code = value.split(OPTION_CODE_SEPARATOR, 1)[0]
+            if code != value:
+                key = normalize_option(code)
+                options[key] = None if key in options else value
+        # A whole option wins over another option's code
+        options.update((normalize_option(value), value) for value in values)
+    return FieldSchema(field["type"], int(max_length) if max_length else None, bool(field.get("disabled")),
+                       option_values, options, position, field.get("value"))
+
+class PortalSchema:
+    """Form field constraints by element id, applied to mapped profiles"""
+
+    def __init__(self, definition: Dict[str, List[Dict[str, Any]]]):
+        form_fields = [field for fields in definition.values() for field in fields]
+        self.fields = {field["id"]: compile_field(field, position) for position, field in enumerate(form_fields)}
+
+    def match_option(self, schema: FieldSchema, value: Any, violations: Counter) -> Any:
+        """The form's option for value, or value itself if it matches none"""
+        if not isinstance(value, str) or value in schema.option_values:
+            return value
+        option = schema.options.get(normalize_option(value))
+        if option is None:
+            violations["invalid_option"] += 1
+            return value
+        violations["canonicalized"] += 1
+        return option
+
+    def apply(self, mapping: Dict[str, Any]) -> Tuple[Dict[str, Any], Counter]:
+        """
+        Validates and coerces a mapped profile.
+
+        Args:
+            mapping: Element id -> value, as returned by map_profile
+
+        Returns:
+            The coerced mapping, in the same order, and the number of values dropped
+            (disabled), truncated, canonicalized, matching no option (invalid_option) or
+            too long but not text (too_long)
+        """
+        coerced = {}
+        violations = Counter()
+        for element_id, value in mapping.items():
+            schema = self.fields.get(element_id)
+            if schema is not None and schema.disabled:
+                violations["disabled"] += 1
+                continue
+            if schema is None or value is None or value == "" or value == []:
+                coerced[element_id] = value
+                continue
+            if schema.options is not None:
+                if isinstance(value, list):
+                    value = [self.match_option(schema, item, violations) for item in value]
+                else:
+                    value = self.match_option(schema, value, violations)
+            elif schema.max_length is not None and len(str(value)) > schema.max_length:
+                if isinstance(value, str):
+                    violations["truncated"] += 1
+                    value = value[:schema.max_length]
+                else:
+                    violations["too_long"] += 1
+            coerced[element_id] = value
+        return coerced, violations
+
+@lru_cache(maxsize=None)
+def get_portal_schema(filename: str) -> PortalSchema:
+    """The compiled schema of the definition in filename, built once per process"""
+    return PortalSchema(load_portal_definition(filename))
@@ -0,0 +1,28 @@
+from typing import Dict, Any, Iterable, Set
+
+# Joins field values in the corpus. Search terms never contain it, so a term can only
+# match inside a single value, as it did when every value was searched on its own.
+FIELD_SEPARATOR = "\x00"
+
+class ProfileTextIndex:
+    """
+    Lowercased text of every non-null profile value, built once per profile so repeated
+    term searches do not re-stringify the whole profile.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.values = {key: str(value).lower() for key, value in data.items() if value is not None}
+        self.corpus = FIELD_SEPARATOR.join(self.values.values())
+        self._categories = {}
+
+    def contains_any(self, terms: Iterable[str]) -> bool:
+        """True if any term occurs, case-insensitively, in any field value"""
+        corpus = self.corpus
+        return any(term.lower() in corpus for term in terms)
+
+    def categories(self, matcher) -> Set[str]:
+        """Categories of the matcher's terms found in the profile, scanned once per matcher"""
+        if matcher not in self._categories:
+            self._categories[matcher] = matcher.scan(self.corpus)
+        return self._categories[matcher]
@@ -0,0 +1,224 @@
+from dot_shipping import DOT_SHIPPING_FIELDS
+from field_rules import WHOLE_PROFILE
+
+# Tradebe portal element id -> rule spec, in form order. See field_rules for the rule kinds
+# and for the "reads" of rules that call mapper methods.
+# The chemical composition rows are numbered per profile and are added by the mapper.
+
+ODOR_MAPPING = {
+    "None": "NONE",
+    "Mild": "MILD",
+    "Strong": "STRONG"
+}
+
+BTU_RANGES = {
+    # For 0-4999 range, select the appropriate sub-range
+    # Default to middle range if no additional info
+    "0 - 4999": "3,000 - 5,000",
+    "5,000 - 10,000": "5,000 - 10,000",
+    "> 10,000": "> 10,000 (EX. OIL)",
+}
+
+PH_RANGES = {
+    "≤ 2": "< =2.0",
+    "> 2 to ≤ 5": "2.1-4.0",
+    "> 5 to ≤ 10": "4.1-10.0",
+    "> 10 to ≤ 12.5": "10.1-12.4",
+    "≥ 12.5": ">=12.4"
+}
+
+FLASH_POINT_RANGES = {
+    "< 73°F": "< 73 F",
+    "≥ 73°F to < 100°F": "73 - 99 F",
+    "≥ 100°F to < 140°F": "100 - 139 F",
+    "≥ 140°F to < 150°F": "140 - 200 F",  # Note: Mapped to broader Tradebe range
+    "≥ 150°F to < 200°F": "140 - 200 F",  # Same broader range
+    "≥ 200°F": "> 200 F"
+}
+
+FREQUENCY_MAPPING = {
+    "One Time": "ONE TIME SHIPMENT",
+    "Monthly": "PER MONTH",
+    "Quarterly": "PER QUARTER",
+    "Annually": "PER YEAR",
+    "Other": "ONE TIME SHIPMENT"
+}
+
+# Profile fields of the chemical composition, structured (ChemicalComposition) or legacy
+CHEMICAL_COMPOSITION_FIELDS = ["ChemicalComposition", "ChemicalPhysicalComposion", "CAS", "Min", "Max"]
+
+# Portal form definition (see portal_definitions) that element ids and sections are checked against
+TRADEBE_FORM_DEFINITION = "Tradebe_v2.json"
+# Section name selecting the chemical composition rows, which the form definition does not list
+CHEMICAL_COMPOSITION_SECTION = "Chemical_Composition"
+
+# PCPOtherProperties fields that map directly to a special characteristic
+SPECIAL_CHARACTERISTIC_PROPERTIES = {
+    "PCPOtherPropertiesOxidizer": "OXIDIZER",
+    "PCPOtherPropertiesExplosive": "EXPLOSIVE",
+    "PCPOtherPropertiesShockSensitive": "SHOCK SENSITIVE",
+    "PCPOtherPropertiesWaterReactive": "WATER REACTIVE",
+    "PCPOtherPropertiesRadioactive": "RADIOACTIVE",
+    "PCPOtherPropertiesPolymerizable": "POLYMERIZER",
+    "PCPOtherPropertiesAirReactive": "AIR REACTIVE",
+    "PCPOtherPropertiesPyrophoric": "PYROPHORIC",
+    "PCPOtherPropertiesOrganaicPeroxides": "ORGANIC PEROXIDE",
+    "PCPOtherPropertiesDioxins": "DIOXIN OR SUSPECT",
+}
+
+# Fields coerced into a TradebeProfile, see tradebe_profile. rds-query boolean columns,
+# set when the value == True
+PROFILE_FLAG_FIELDS = list(dict.fromkeys([
+    "WasteDetermination_GenKnowledge",
+    "WasteDetermination_SDS",
+    "WasteDetermination_WasteAnylysis",
+    *SPECIAL_CHARACTERISTIC_PROPERTIES,
+    "PCPOtherPropertiesMetalFines",
+    "PCPOtherPropertiesAbestosFriable",
+    "PCPOtherPropertiesAbestosNonFriable",
+    "PCPOtherPropertiesReactiveCyanides",
+    "PCPOtherPropertiesReactiveSulfides",
+    "TransContainer_PortableToteTank",
+    "TransContainer_Drum",
+    "TransContainer_CubicYardBox",
+    "TransContainer_BoxCartonCase",
+    "TransBulkType_TankTruck",
+    "TransBulkType_RollOff",
+]))
+
+# "Yes"/"No" answers, set when the value == "Yes"
+PROFILE_YES_FIELDS = [
+    "HazardousWaste",
+    "WCHazardousIgnitable",
+    "WCHazardousCorrosive",
+    "WCHazardousReactive",
+    "WCHazardousToxic",
+    "WCHazardousF",
+    "WCHazardousK",
+    "WCHazardousP",
+    "WCHazardousU",
+    "RCRAExempt",
+    "MedicalWaste",
+    "TSCAregulatortedPCBWaste",
+    "UsedOil",
+]
+
+# Physical state checkboxes, which may also arrive as "TRUE", "YES" or "1" text
+PHYSICAL_STATE_FIELDS = {
+    "SOLID": "PCPhysicalStateSolid2",
+    "LIQUID": "PCPPhysicalStateLiquid2",
+    "SLUDGE": "PCPPhysicalStateSludge2",
+    "GAS": "PCPPhysicalStateGas2"
+}
+
+# Listed waste codes the generator entered
+RCRA_LISTED_CODE_FIELDS = ["hazardouswastenof", "hazardouswastenoK", "hazardouswastenoP", "hazardouswastenou"]
+
+# Portable tote tank sizes in gallons, binned like range_bin rules. Larger totes get no size option.
+TOTE_SIZE_RANGES = [
+    [275, "<", "<275 GALLON TOTE"],
+    [330, "<=", "275-330 GALLON TOTE"],
+    [500, "<=", "331-500 GALLON TOTE"],
+]
+
+TRADEBE_FIELD_RULES = {
+    # Waste Stream section
+    # "__input3-__clone50-inner": {"kind": "value", "field": "CustomerProfile_id"},
+    "__input3-__clone52-inner": {"kind": "value", "field": "StateWasteCode"},
+    "__input3-__clone54-inner": {"kind": "value", "field": "Name", "default": ""},
+    "__area1-__clone56-inner": {"kind": "value", "field": "ProcessGeneratingTheWaste", "default": ""},
+    "__box1-__clone58-inner": {"kind": "yes_no", "field": "RCRAExempt"},
+    "__box1-__clone62-inner": {"kind": "yes_no", "field": "CERCLAregulatortedWaste"},
+    "__box2-__clone64-inner": {"kind": "method", "name": "_get_waste_determination",
+                               "reads": ["WasteDetermination_GenKnowledge", "WasteDetermination_SDS",
+                                         "WasteDetermination_WasteAnylysis"]},
+    "__box1-__clone68-inner": {"kind": "regex_extract", "field": "EPAFormCode", "pattern": r"W\d{3}",
+                               "missing": "", "no_match": "NONE"},
+    "__box1-__clone70-inner": {"kind": "value", "field": "EPASourceCode", "default": "",
+                               "substitutions": {"N/A": "NULL - NO VALUE"}},
+
+    # Waste Characteristics section
+    "__box3-__clone72-inner": {"kind": "method", "name": "_map_special_characteristics",
+                               "reads": [*SPECIAL_CHARACTERISTIC_PROPERTIES, "ChemicalComposition",
+                                         "ChemicalPhysicalComposion", "MedicalWaste", "TransportationRequirement"]},
+    "__input4-__clone74-inner": {"kind": "method", "name": "_get_viscosity", "reads": ["PCPViscosity"]},
+    "__input4-__clone76-inner": {"kind": "value", "field": "PCSpecificGravity", "default": ""},
+    "__input4-__clone78-inner": {"kind": "value", "field": "PCPTotalOrganicCarbonValue", "default": ""},
+    "__box4-__clone84-inner": {"kind": "lookup", "field": "PCPOdor", "table": ODOR_MAPPING, "default": ""},
+    "__input4-__clone86-inner": {"kind": "value", "field": "PCPOdor_Radio_Plus_Option", "default": ""},
+    "__input4-__clone88-inner": {"kind": "value", "field": "PCPColor", "default": ""},
+    "__box4-__clone90-inner": {"kind": "method", "name": "_determine_physical_state",
+                               "reads": ["PCPhysicalStateSolid2", "PCPPhysicalStateLiquid2", "PCPPhysicalStateSludge2",
+                                         "PCPPhysicalStateGas2"]},
+    "__box4-__clone94-inner": {"kind": "method", "name": "_map_phases", "reads": ["PCNumberOfPhases_Layer"]},
+    "__box4-__clone98-inner": {"kind": "lookup", "field": "PCPBTUValue", "table": BTU_RANGES, "default": ""},
+    "__box4-__clone100-inner": {
+        "kind": "range_bin", "field": "PCpH", "standard": PH_RANGES,
+        "custom_trigger": "Custom", "custom_field": "pc_ph_radio_plus_option",
+        "bins": [[2.0, "<=", "< =2.0"], [4.0, "<=", "2.1-4.0"], [10.0, "<=", "4.1-10.0"], [12.4, "<=", "10.1-12.4"]],
+        "above": ">=12.4", "missing": "NA",
+    },
+    "__box4-__clone102-inner": {
+        "kind": "range_bin", "field": "PCFlashPoint", "standard": FLASH_POINT_RANGES,
+        "custom_trigger": "Actual", "custom_field": "PCFlashPoint_Actual",
+        "bins": [[73, "<", "< 73 F"], [100, "<", "73 - 99 F"], [140, "<", "100 - 139 F"], [200, "<=", "140 - 200 F"]],
+        "above": "> 200 F", "missing": "NONE",
+    },
+
+    # Additional Information
+    "__box9-__clone107-inner": {"kind": "method", "name": "_determine_special_contents", "reads": WHOLE_PROFILE},
+    "__input8-__clone109-inner": {"kind": "method", "name": "_get_metal_fines_description", "reads": WHOLE_PROFILE},
+    "__input8-__clone111-inner": {"kind": "value", "field": "PCPOtherPropertiesReactiveCyanides_Range", "default": "0"},
+    "__input8-__clone113-inner": {"kind": "value", "field": "PCPOtherPropertiesReactiveSulfides_Range", "default": "0"},
+    "__box10-__clone117-inner": {"kind": "yes_no", "field": "BenzeneNESHAPWaste"},
+    "__box10-__clone119-inner": {"kind": "yes_no", "field": "UsedOil"},
+    "__box10-__clone123-inner": {"kind": "yes_no", "field": "HalogenatedOrganicCompound",
+                                 "or_check": "_check_common_chlorinated_constituents", "reads": WHOLE_PROFILE},
+    "__box10-__clone125-inner": {"kind": "const", "value": "N"},
+    "__box10-__clone127-inner": {"kind": "yes_no", "field": "Regulatory500PPMVOC"},
+    "__box10-__clone131-inner": {"kind": "term_flag", "category": "pfas"},
+
+    # RCRA Characterization section
+    "__box11-__clone133-inner": {"kind": "yes_no", "field": "HazardousWaste"},
+    "__box11-__clone135-inner": {"kind": "yes_no", "field": "UniversalWaste"},
+    "__box11-__clone137-inner": {"kind": "term_flag", "category": "f006_f019"},
+    "__box12-__clone139-inner": {"kind": "method", "name": "_get_waste_codes", "reads": WHOLE_PROFILE},
+    "__box11-__clone145-inner": {"kind": "yes_no", "field": "RegulatoryLDRSubcategory", "equals": "Wastewater"},
+    "__box11-__clone147-inner": {"kind": "yes_no", "field": "RegulatoryLDRSubcategory", "equals": "Wastewater"},
+
+    # Shipping Information section
+    "__box13-__clone149-inner": {"kind": "yes_no", "field": "TransportationRequirement", "equals": "Bulk Liquid"},
+    "__input9-__clone151-inner": {"kind": "method", "name": "_get_shipping_volume",
+                                "reads": ["ShippingAndPackagingVolume", "ShippingAndPackagingVolumeType"]},
+    "__box13-__clone153-inner": {"kind": "yes_no", "field": "TransportationRequirement", "equals": "Bulk Solid"},
+    "__input9-__clone155-inner": {"kind": "method", "name": "_get_shipping_volume",
+                                "reads": ["ShippingAndPackagingVolume", "ShippingAndPackagingVolumeType"]},
+    "__box13-__clone157-inner": {"kind": "yes_no", "field": "TransContainer_PortableToteTank", "equals": "TRUE"},
+    "__box14-__clone159-inner": {"kind": "const", "value": ["METAL", "PLASTIC IN METAL CAGE"]},
+    "__box14-__clone161-inner": {"kind": "method", "name": "_map_container_sizes",
+                                "reads": ["TransContainer_PortableToteTank", "TransContainer_PortToteTankSize",
+                                          "TransContainer_Drum", "TransContainer_DrumSize",
+                                          "TransContainer_CubicYardBox", "TransContainer_BoxCartonCase",
+                                          "TransBulkType_TankTruck", "TransBulkType_RollOff"]},
+    "__box13-__clone167-inner": {"kind": "lookup", "field": "ShippingAndPackagingFrequency",
+                                 "table": FREQUENCY_MAPPING, "default": "AS NEEDED"},
+    "__input9-__clone171-inner": {"kind": "const", "value": 5},
+    "__box13-__clone173-inner": {"kind": "yes_no", "field": "ShippingAndPackagingWasteCombinationPackage"},
+
+    # DOT Information section
+    "__box15-__clone175-inner": {"kind": "yes_no", "field": "ShippingAndPackagingUSDOT"},
+    "__vol0-inner": {"kind": "method", "name": "_extract_un_na_code", "reads": DOT_SHIPPING_FIELDS},
+    "__box15-__clone178-inner": {"kind": "method", "name": "_is_rcra_waste",
+                                "reads": ["HazardousWaste", "WCHazardousIgnitable", "WCHazardousCorrosive",
+                                          "WCHazardousReactive", "WCHazardousToxic", "WCHazardousF", "WCHazardousK",
+                                          "WCHazardousP", "WCHazardousU", "hazardouswastenof", "hazardouswastenoK",
+                                          "hazardouswastenoP", "hazardouswastenou", "RCRAExempt"]},
+    "__area2-__clone180-inner": {"kind": "method", "name": "_extract_constituents",
+                                 "reads": DOT_SHIPPING_FIELDS},
+    "__input10-__clone182-inner": {"kind": "method", "name": "_extract_rq_info",
+                                 "reads": DOT_SHIPPING_FIELDS},
+    "__box15-__clone184-inner": {"kind": "method", "name": "_has_dot_special_permit",
+                                "reads": DOT_SHIPPING_FIELDS},
+    "__input10-__clone186-inner": {"kind": "method", "name": "_extract_special_permit_number",
+                                 "reads": DOT_SHIPPING_FIELDS},
+}
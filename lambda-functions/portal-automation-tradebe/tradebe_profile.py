@@ -0,0 +1,90 @@
+from typing import Dict, Any, List, Optional
+from tradebe_field_rules import (CHEMICAL_COMPOSITION_FIELDS, PHYSICAL_STATE_FIELDS, PROFILE_FLAG_FIELDS,
+                                 PROFILE_YES_FIELDS, RCRA_LISTED_CODE_FIELDS)
+
+def is_true(value: Any) -> bool:
+    """True for True and for "TRUE", "YES" or "1" text in any case"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.upper() in ('TRUE', 'YES', '1')
+    return False
+
+def parse_number(value: Any) -> Optional[float]:
+    """float(value), or None if it is not a number"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+def get_chemical_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Returns the chemical composition as a list of row dicts. rds-query sends the rows
+    as "ChemicalComposition"; the legacy format has comma-joined column strings instead.
+    """
+    if "ChemicalComposition" in data:
+        return data.get("ChemicalComposition") or []
+
+    if not data.get("ChemicalPhysicalComposion"):
+        return []
+    chemicals = data.get("ChemicalPhysicalComposion").split(",")
+    if data.get("CAS"):
+        cas_numbers = data.get("CAS", "").split(",")
+    else:
+        cas_numbers = [""]*len(chemicals)
+    if data.get("Max"):
+        max_values = data.get("Max", "").split(",")
+    else:
+        max_values = [""]*len(chemicals)
+    if data.get("Min"):
+        min_values = data.get("Min", "").split(",")
+    else:
+        min_values = [""]*len(chemicals)
+
+    return [
+        {"ChemicalPhysicalComposion": chem, "CAS": cas, "Min": minimum, "Max": maximum}
+        for chem, cas, minimum, maximum in zip(chemicals, cas_numbers, min_values, max_values)
+    ]
+
+def get_composition_text(data: Dict[str, Any], chemical_rows: List[Dict[str, Any]]) -> str:
+    """Lowercased chemical names joined like the legacy ChemicalPhysicalComposion string"""
+    if "ChemicalComposition" in data:
+        names = [row.get("ChemicalPhysicalComposion") for row in chemical_rows]
+        return ",".join(name for name in names if name is not None).lower()
+    return str(data.get("ChemicalPhysicalComposion", "")).lower()
+
+class TradebeProfile:
+    """
+    Typed view of a raw rds-query profile for the Tradebe rules, coerced in one pass per
+    profile. Rules test flags by set membership and read parsed numbers and composition rows
+    instead of repeating dict lookups and comparisons. Each boolean keeps the test its rules
+    have always used (== True, == "Yes" or is_true), so mappings are unchanged.
+    """
+
+    __slots__ = ("data", "flags", "yes_answers", "physical_states", "listed_codes_entered", "tote_size",
+                 "chemical_rows", "composition_text")
+
+    # Attribute -> the profile fields it is coerced from, apart from the flag and answer sets,
+    # which hold field names
+    attribute_fields = {
+        "physical_states": list(PHYSICAL_STATE_FIELDS.values()),
+        "listed_codes_entered": RCRA_LISTED_CODE_FIELDS,
+        "tote_size": ["TransContainer_PortToteTankSize"],
+        "chemical_rows": CHEMICAL_COMPOSITION_FIELDS,
+        "composition_text": ["ChemicalComposition", "ChemicalPhysicalComposion"],
+    }
+
+    def __init__(self, data: Dict[str, Any]):
+        get = data.get
+        self.data = data
+        # PROFILE_FLAG_FIELDS that are == True and PROFILE_YES_FIELDS answered "Yes"
+        self.flags = frozenset([field for field in PROFILE_FLAG_FIELDS if get(field) == True])
+        self.yes_answers = frozenset([field for field in PROFILE_YES_FIELDS if get(field) == "Yes"])
+        # PHYSICAL_STATE_FIELDS keys of the checked states
+        self.physical_states = frozenset([state for state, field in PHYSICAL_STATE_FIELDS.items()
+                                          if is_true(get(field))])
+        self.listed_codes_entered = any(get(field) and str(get(field)).strip() for field in RCRA_LISTED_CODE_FIELDS)
+        tote_size = get("TransContainer_PortToteTankSize", "")
+        self.tote_size = parse_number(tote_size) if tote_size else None
+        self.chemical_rows = get_chemical_rows(data)
+        self.composition_text = get_composition_text(data, self.chemical_rows)
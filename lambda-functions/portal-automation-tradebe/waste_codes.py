@@ -0,0 +1,96 @@
+import re
+from typing import Dict, Any, Iterable, Set
+
+# Listed (F, K, P, U) and characteristic (D) RCRA hazardous waste codes recognized in profile text
+RCRA_WASTE_CODES = frozenset([
+    'F001', 'F002', 'F003', 'F004', 'F005', 'F006', 'F007', 'F008', 'F009', 'F010', 'F011', 'F012', 
+    'F019', 'F020', 'F021', 'F022', 'F023', 'F024', 'F025', 'F026', 'F027', 'F028', 'F032', 'F034', 
+    'F035', 'F037', 'F038', 'F039', 'K001', 'K002', 'K003', 'K004', 'K005', 'K006', 'K007', 'K008', 
+    'K009', 'K010', 'K011', 'K013', 'K014', 'K015', 'K016', 'K017', 'K018', 'K019', 'K020', 'K021', 
+    'K022', 'K023', 'K024', 'K025', 'K026', 'K027', 'K028', 'K029', 'K030', 'K031', 'K032', 'K033', 
+    'K034', 'K035', 'K036', 'K037', 'K038', 'K039', 'K040', 'K041', 'K042', 'K043', 'K044', 'K045', 
+    'K046', 'K047', 'K048', 'K049', 'K050', 'K051', 'K052', 'K060', 'K061', 'K062', 'K069', 'K071', 
+    'K073', 'K083', 'K084', 'K085', 'K086', 'K087', 'K088', 'K093', 'K094', 'K095', 'K096', 'K097', 
+    'K098', 'K099', 'K100', 'K101', 'K102', 'K103', 'K104', 'K105', 'K106', 'K107', 'K108', 'K109', 
+    'K110', 'K111', 'K112', 'K113', 'K114', 'K115', 'K116', 'K117', 'K118', 'K123', 'K124', 'K125', 
+    'K126', 'K131', 'K132', 'K136', 'K141', 'K142', 'K143', 'K144', 'K145', 'K147', 'K148', 'K149', 
+    'K150', 'K151', 'K156', 'K157', 'K158', 'K159', 'K161', 'K169', 'K170', 'K171', 'K172', 'K174', 
+    'K175', 'K176', 'K177', 'K178', 'K181', 'P001', 'P002', 'P003', 'P004', 'P005', 'P006', 'P007', 
+    'P008', 'P009', 'P010', 'P011', 'P012', 'P013', 'P014', 'P015', 'P016', 'P017', 'P018', 'P020', 
+    'P021', 'P022', 'P023', 'P024', 'P026', 'P027', 'P028', 'P029', 'P030', 'P031', 'P033', 'P034', 
+    'P036', 'P037', 'P038', 'P039', 'P040', 'P041', 'P042', 'P043', 'P044', 'P045', 'P046', 'P047', 
+    'P048', 'P049', 'P050', 'P051', 'P054', 'P056', 'P057', 'P058', 'P059', 'P060', 'P062', 'P063', 
+    'P064', 'P065', 'P066', 'P067', 'P068', 'P069', 'P070', 'P071', 'P072', 'P073', 'P074', 'P075', 
+    'P076', 'P077', 'P078', 'P081', 'P082', 'P084', 'P085', 'P087', 'P088', 'P089', 'P092', 'P093', 
+    'P094', 'P095', 'P096', 'P097', 'P098', 'P099', 'P101', 'P102', 'P103', 'P104', 'P105', 'P106', 
+    'P108', 'P109', 'P110', 'P111', 'P112', 'P113', 'P114', 'P115', 'P116', 'P118', 'P119', 'P120', 
+    'P121', 'P122', 'P123', 'P127', 'P128', 'P185', 'P188', 'P189', 'P190', 'P191', 'P192', 'P194', 
+    'P196', 'P197', 'P198', 'P199', 'P201', 'P202', 'P203', 'P204', 'P205', 'U001', 'U002', 'U003', 
+    'U004', 'U005', 'U006', 'U007', 'U008', 'U009', 'U010', 'U011', 'U012', 'U014', 'U015', 'U016', 
+    'U017', 'U018', 'U019', 'U020', 'U021', 'U022', 'U023', 'U024', 'U025', 'U026', 'U027', 'U028', 
+    'U029', 'U030', 'U031', 'U032', 'U033', 'U034', 'U035', 'U036', 'U037', 'U038', 'U039', 'U041', 
+    'U042', 'U043', 'U044', 'U045', 'U046', 'U047', 'U048', 'U049', 'U050', 'U051', 'U052', 'U053', 
+    'U055', 'U056', 'U057', 'U058', 'U059', 'U060', 'U061', 'U062', 'U063', 'U064', 'U066', 'U067', 
+    'U068', 'U069', 'U070', 'U071', 'U072', 'U073', 'U074', 'U075', 'U076', 'U077', 'U078', 'U079', 
+    'U080', 'U081', 'U082', 'U083', 'U084', 'U085', 'U086', 'U087', 'U088', 'U089', 'U090', 'U091', 
+    'U092', 'U093', 'U094', 'U095', 'U096', 'U097', 'U098', 'U099', 'U101', 'U102', 'U103', 'U105', 
+    'U106', 'U107', 'U108', 'U109', 'U110', 'U111', 'U112', 'U113', 'U114', 'U115', 'U116', 'U117', 
+    'U118', 'U119', 'U120', 'U121', 'U122', 'U123', 'U124', 'U125', 'U126', 'U127', 'U128', 'U129', 
+    'U130', 'U131', 'U132', 'U133', 'U134', 'U135', 'U136', 'U137', 'U138', 'U140', 'U141', 'U142', 
+    'U143', 'U144', 'U145', 'U146', 'U147', 'U148', 'U149', 'U150', 'U151', 'U152', 'U153', 'U154', 
+    'U155', 'U156', 'U157', 'U158', 'U159', 'U160', 'U161', 'U162', 'U163', 'U164', 'U165', 'U166', 
+    'U167', 'U168', 'U169', 'U170', 'U171', 'U172', 'U173', 'U174', 'U176', 'U177', 'U178', 'U179', 
+    'U180', 'U181', 'U182', 'U183', 'U184', 'U185', 'U186', 'U187', 'U188', 'U189', 'U190', 'U191', 
+    'U192', 'U193', 'U194', 'U196', 'U197', 'U200', 'U201', 'U202', 'U203', 'U204', 'U205', 'U206', 
+    'U207', 'U208', 'U209', 'U210', 'U211', 'U213', 'U214', 'U215', 'U216', 'U217', 'U218', 'U219', 
+    'U220', 'U221', 'U222', 'U223', 'U225', 'U226', 'U227', 'U228', 'U234', 'U235', 'U236', 'U237', 
+    'U238', 'U239', 'U240', 'U243', 'U244', 'U246', 'U247', 'U248', 'U249', 'U271', 'U278', 'U279', 
+    'U280', 'U328', 'U353', 'U359', 'U364', 'U367', 'U372', 'U373', 'U387', 'U389', 'U394', 'U395', 
+    'U404', 'U409', 'U410', 'U411', 'D001', 'D002', 'D003', 'D004', 'D005', 'D006', 'D007', 'D008', 
+    'D009', 'D010', 'D011', 'D012', 'D013', 'D014', 'D015', 'D016', 'D017', 'D018', 'D019', 'D020', 
+    'D021', 'D022', 'D023', 'D024', 'D025', 'D026', 'D027', 'D028', 'D029', 'D030', 'D031', 'D032', 
+    'D033', 'D034', 'D035', 'D036', 'D037', 'D038', 'D039', 'D040', 'D041', 'D042', 'D043'])
+
+# A code-shaped token: a listing letter and three digits, not part of a longer word or number
+WASTE_CODE_PATTERN = re.compile(r"(?<![a-z0-9])([dfkpu]\d{3})(?!\d)", re.IGNORECASE)
+
+# Characteristic codes set by the generator's RCRA characterization answers
+CHARACTERISTIC_CODE_FIELDS = {
+    "WCHazardousIgnitable": "D001",
+    "WCHazardousCorrosive": "D002",
+    "WCHazardousReactive": "D003",
+    "WCHazardousToxic": "D004",
+}
+
+# Listing letter -> (flag field, fields carrying the comma-separated listed codes)
+LISTED_CODE_FIELDS = {
+    "F": ("WCHazardousF", ("hazardouswastenof",)),
+    "K": ("WCHazardousK", ("hazardouswastenoK",)),
+    "P": ("WCHazardousP", ("hazardouswastenoP",)),
+    "U": ("WCHazardousU", ("hazardouswastenoU", "hazardouswastenou")),
+}
+
+def find_waste_codes(text: str) -> Set[str]:
+    """Returns the valid RCRA codes mentioned anywhere in text, uppercased"""
+    codes = {match.upper() for match in WASTE_CODE_PATTERN.findall(text)}
+    return codes & RCRA_WASTE_CODES
+
+def get_declared_waste_codes(data: Dict[str, Any]) -> Set[str]:
+    """
+    Returns the codes the generator declared: D001-D004 from the characteristic answers, and
+    the listed codes of every F/K/P/U listing answered "Yes". Listed codes only have to be
+    well-formed (the listing letter and three digits), as the generator entered them.
+    """
+    codes = {code for field, code in CHARACTERISTIC_CODE_FIELDS.items() if data.get(field) == "Yes"}
+    for letter, (flag_field, list_fields) in LISTED_CODE_FIELDS.items():
+        if data.get(flag_field) != "Yes":
+            continue
+        for list_field in list_fields:
+            codes.update(_split_listed_codes(data.get(list_field), letter))
+    return codes
+
+def _split_listed_codes(value: Any, letter: str) -> Iterable[str]:
+    if not value:
+        return []
+    codes = [code.strip().upper() for code in str(value).split(",") if code.strip()]
+    return [code for code in codes if code.startswith(letter) and len(code) == 4 and code[1:].isdigit()]
@@ -0,0 +1,117 @@
+"""
+Streams every assembled customer profile as NDJSON, one profile per line.
+
+Profiles are read through a named (server-side) cursor, so only `itersize` rows are held
+in memory at a time, and are emitted in profile id order. An interrupted export can be
+resumed from the last profile written to the output file.
+
+Usage:
+    python export_profiles.py profiles.ndjson --itersize 500
+    python export_profiles.py profiles.ndjson --resume
+    python export_profiles.py - --after-id 114000 > profiles.ndjson
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from lambda_function import SCHEMA, build_profile_join_query, encode_body, get_db_connection, merge_profile_row
+
+DEFAULT_ITERSIZE = int(os.environ.get('EXPORT_ITERSIZE', '500'))
+
+
+def build_export_query(schema):
+    return build_profile_join_query(
+        schema,
+        key='cp."id"',
+        source=f'{schema}.generator_customerprofile cp',
+        suffix='WHERE cp."id" > %(after_id)s ORDER BY cp."id"')
+
+
+def export_profiles(conn, schema=SCHEMA, after_id=0, itersize=DEFAULT_ITERSIZE):
+    """
+    Yields (profile_id, profile) for every customer profile with an id above after_id.
+    The profile dicts are merged exactly like the single-profile handler's response.
+    """
+    with conn.cursor(name='profile_export') as cur:
+        cur.itersize = itersize
+        cur.execute(build_export_query(schema), {'after_id': after_id})
+        columns = None
+        for row in cur:
+            if columns is None:
+                columns = [desc[0] for desc in cur.description]
+            yield row[0], merge_profile_row(columns, row)
+
+
+def read_last_exported_id(path):
+    """
+    Returns the id of the last complete profile in an NDJSON export, or 0 if there is none.
+    A trailing partial line left by an interrupted run is truncated away.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        chunk_size = 64 * 1024
+        while True:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            tail = f.read(end - start)
+            if tail.count(b'\n') >= 2 or start == 0:
+                break
+            chunk_size *= 2
+
+        complete, newline, partial = tail.rpartition(b'\n')
+        if partial:
+            f.truncate(start + len(complete) + len(newline))
+        last_line = complete.rsplit(b'\n', 1)[-1]
+
+    if not last_line.strip():
+        return 0
+    profile = json.loads(last_line)
+    # Later tables overwrite "id", but every table other than the customer profile carries CustomerProfile_id
+    return int(profile.get('CustomerProfile_id') or profile['id'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output', help="NDJSON file to write, or '-' for stdout")
+    parser.add_argument('--itersize', type=int, default=DEFAULT_ITERSIZE,
+                        help='rows fetched from the server-side cursor per round trip')
+    parser.add_argument('--after-id', type=int, default=0, help='only export profiles with a greater id')
+    parser.add_argument('--resume', action='store_true',
+                        help='append to output, continuing after the last profile it contains')
+    args = parser.parse_args()
+
+    after_id = args.after_id
+    if args.resume:
+        if args.output == '-':
+            parser.error('--resume needs an output file')
+        after_id = max(after_id, read_last_exported_id(args.output))
+        print(f'Resuming after profile {after_id}', file=sys.stderr)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'a' if args.resume else 'w', encoding='utf-8')
+    conn = get_db_connection()
+    count = 0
+    start = time.perf_counter()
+    try:
+        for profile_id, profile in export_profiles(conn, after_id=after_id, itersize=args.itersize):
+            out.write(encode_body(profile) + '\n')
+            count += 1
+            if count % args.itersize == 0:
+                out.flush()
+                print(f'{count} profiles exported, last id {profile_id}', file=sys.stderr)
+    finally:
+        out.flush()
+        if out is not sys.stdout:
+            out.close()
+        conn.close()
+
+    elapsed = time.perf_counter() - start
+    print(f'Exported {count} profiles in {elapsed:.1f}s', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
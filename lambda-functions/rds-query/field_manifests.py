@@ -0,0 +1,110 @@
+"""
+Source fields each portal mapper reads from an assembled profile.
+
+A request with ?projection=<mapper> selects only these columns instead of SELECT *. Fields
+are matched against the live table columns, so a field only has to be listed once here and
+is picked up from whichever profile table carries it. Chemical composition is always
+returned in full.
+
+The mappers' full-text term scans (special contents, PFAS, chlorinated constituents, waste
+codes) search every value of the profile, not named fields. A manifest for such a mapper
+holds TEXT_COLUMNS, which selects every text column, so a term is found wherever it is
+written. tests/test_field_manifests.py checks each mapper against its manifest.
+
+Run this module against the data dictionary to cross-check a manifest:
+    python field_manifests.py ../../WASTELINQ-Portal-Automation/portals/WASTELINQ_profile_data.json
+"""
+import json
+import sys
+
+# Fields the popup displays before the profile is sent to a mapper
+POPUP_FIELDS = (
+    'CustomerProfile_id',
+    'Name',
+    'WasteStreamDescription',
+    'ProcessGeneratingTheWaste',
+)
+
+# Manifest entry that selects every column of one of TEXT_DATA_TYPES (information_schema names)
+TEXT_COLUMNS = '*text'
+TEXT_DATA_TYPES = frozenset(['text', 'character varying', 'character', 'json', 'jsonb'])
+
+FIELD_MANIFESTS = {
+    'tradebe': frozenset(POPUP_FIELDS + (
+        # Term scans over the whole profile
+        TEXT_COLUMNS,
+        # Waste Stream
+        'StateWasteCode', 'RCRAExempt', 'CERCLAregulatortedWaste', 'EPAFormCode', 'EPASourceCode',
+        'WasteDetermination_GenKnowledge', 'WasteDetermination_SDS', 'WasteDetermination_WasteAnylysis',
+        # Waste Characteristics
+        'PCPViscosity', 'PCSpecificGravity', 'PCPTotalOrganicCarbonValue', 'PCPOdor', 'PCPOdor_Radio_Plus_Option',
+        'PCPColor', 'PCPhysicalStateSolid2', 'PCPPhysicalStateLiquid2', 'PCPPhysicalStateSludge2',
+        'PCPPhysicalStateGas2', 'PCNumberOfPhases_Layer', 'PCPBTUValue', 'PCpH', 'pc_ph_radio_plus_option',
+        'PCFlashPoint', 'PCFlashPoint_Actual', 'MedicalWaste',
+        'PCPOtherPropertiesOxidizer', 'PCPOtherPropertiesExplosive', 'PCPOtherPropertiesShockSensitive',
+        'PCPOtherPropertiesWaterReactive', 'PCPOtherPropertiesRadioactive', 'PCPOtherPropertiesPolymerizable',
+        'PCPOtherPropertiesAirReactive', 'PCPOtherPropertiesPyrophoric', 'PCPOtherPropertiesOrganaicPeroxides',
+        'PCPOtherPropertiesDioxins',
+        # Additional Information
+        'PCPOtherPropertiesMetalFines', 'PCPOtherPropertiesMetalFines_Description',
+        'PCPOtherPropertiesAbestosFriable', 'PCPOtherPropertiesAbestosNonFriable',
+        'PCPOtherPropertiesReactiveCyanides', 'PCPOtherPropertiesReactiveCyanides_Range',
+        'PCPOtherPropertiesReactiveSulfides', 'PCPOtherPropertiesReactiveSulfides_Range',
+        'TSCAregulatortedPCBWaste', 'BenzeneNESHAPWaste', 'UsedOil', 'HalogenatedOrganicCompound',
+        'Regulatory500PPMVOC',
+        # RCRA Characterization
+        'HazardousWaste', 'UniversalWaste', 'RegulatoryLDRSubcategory',
+        'WCHazardousIgnitable', 'WCHazardousCorrosive', 'WCHazardousReactive', 'WCHazardousToxic',
+        'WCHazardousF', 'WCHazardousK', 'WCHazardousP', 'WCHazardousU',
+        'hazardouswastenof', 'hazardouswastenoK', 'hazardouswastenoP', 'hazardouswastenoU', 'hazardouswastenou',
+        # Shipping Information
+        'TransportationRequirement', 'ShippingAndPackagingVolume', 'ShippingAndPackagingVolumeType',
+        'ShippingAndPackagingFrequency', 'ShippingAndPackagingWasteCombinationPackage',
+        'TransContainer_PortableToteTank', 'TransContainer_PortToteTankSize', 'TransContainer_Drum',
+        'TransContainer_DrumSize', 'TransContainer_CubicYardBox', 'TransContainer_BoxCartonCase',
+        'TransBulkType_TankTruck', 'TransBulkType_RollOff',
+        # DOT Information
+        'ShippingAndPackagingUSDOT', 'ShippingAndPackagingUSDOTComment', 'fddDOTNotesSpecialPermits',
+    )),
+}
+
+
+def get_manifest(mapper):
+    manifest = FIELD_MANIFESTS.get(mapper.lower())
+    if manifest is None:
+        raise ValueError(f'No field manifest for mapper: {mapper}')
+    return manifest
+
+
+def check_manifest(mapper, profile_data_path, queried_tables):
+    """
+    Cross-checks a manifest against the WASTELINQ data dictionary. Returns the fields the
+    dictionary does not know, and the fields it places in a table rds-query does not read.
+    """
+    with open(profile_data_path, 'r', encoding='utf-8') as f:
+        dictionary = json.load(f)
+    tables_by_field = {}
+    for entry in dictionary.values():
+        tables_by_field.setdefault(entry['name'], set()).add(entry['table_name'])
+
+    undocumented = []
+    other_tables = {}
+    for field in sorted(get_manifest(mapper) - {TEXT_COLUMNS}):
+        tables = tables_by_field.get(field)
+        if not tables:
+            undocumented.append(field)
+        elif not tables & set(queried_tables):
+            other_tables[field] = sorted(tables)
+    return {'undocumented': undocumented, 'other_tables': other_tables}
+
+
+if __name__ == '__main__':
+    from lambda_function import PROFILE_TABLES
+
+    queried_tables = [table for table, _, _ in PROFILE_TABLES]
+    for mapper in FIELD_MANIFESTS:
+        result = check_manifest(mapper, sys.argv[1], queried_tables)
+        print(f'{mapper}: {len(FIELD_MANIFESTS[mapper])} fields')
+        print(f"  not in the data dictionary: {', '.join(result['undocumented']) or 'none'}")
+        for field, tables in result['other_tables'].items():
+            print(f"  {field} is documented in {', '.join(tables)}, which rds-query does not read")
@@ -1,38 +1,125 @@
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+
+from field_manifests import TEXT_COLUMNS, TEXT_DATA_TYPES, get_manifest
+from profile_cache import create_profile_cache
+from profile_json import encode_json, register_typecasters
+
+SCHEMA = 'network'
+
+# Tables that make up an assembled profile, in merge order: (table, id column, multi-value).
+# Later tables win on duplicate column names, as in the original dict merge.
+PROFILE_TABLES = [
+    ('generator_customerprofile', 'id', False),
+    ('generator_generatingprocessandmaterialcomposition', 'CustomerProfile_id', False),
+    ('generator_wasteprofilechemical', 'GeneratingProcessAndMaterialComposition_id', True),
+    ('generator_physicalandchemicalproperties', 'CustomerProfile_id', False),
+    ('generator_regulatoryinformation', 'CustomerProfile_id', False),
+    ('generator_shippingandpackaginginformation', 'CustomerProfile_id', False),
+    # ('communication_pricingrequeststream', 'CustomerProfile_id', False),
+]
+
+# 'sequential' runs one SELECT per table, 'join' assembles the profile in a single statement,
+# 'parallel' runs the per-table SELECTs concurrently on one connection per table
+PROFILE_QUERY_MODE = os.environ.get('PROFILE_QUERY_MODE', 'sequential')
+
+# Mapper whose field manifest limits the selected columns when a request does not pass ?projection=
+PROFILE_PROJECTION = os.environ.get('PROFILE_PROJECTION')
+
+# Run the per-table profile queries as server-side prepared statements, so they are parsed and
+# planned once per connection. Note that RDS Proxy pins the session once a statement is prepared.
+USE_PREPARED_STATEMENTS = os.environ.get('PREPARED_STATEMENTS', 'false').lower() == 'true'
+
+# Read dates/timestamps as ISO strings and NUMERIC as its text, and encode bodies with encode_json.
+# When off, values keep their psycopg2 types and are serialized with json.dumps(default=str).
+TYPED_JSON = os.environ.get('TYPED_JSON', 'true').lower() == 'true'
+
+# Upper bound on the number of ids accepted by one batch request
+MAX_BATCH_IDS = int(os.environ.get('MAX_BATCH_IDS', '500'))
+
+# A reused connection idle for longer than this is pinged before use
+CONNECTION_CHECK_AFTER = float(os.environ.get('CONNECTION_CHECK_AFTER', '30'))
+
+# Connections kept alive across warm invocations of the same container, by slot. Slot 0 serves
+# every request; parallel mode adds one slot per additional profile table.
+_connections = {}
+_connections_last_used = {}
+CONNECTION_STATS = {'connects': 0, 'hits': 0, 'reconnects': 0}
+
+# Worker threads for PROFILE_QUERY_MODE=parallel, created on first use
+_parallel_executor = None
+
+# Cache of encoded single-profile responses: 'none', 'memory' (LRU in the warm container) or
+# 'sqlite' (a local file at PROFILE_CACHE_PATH). Entries are checked against the profile's
+# current row versions before they are served, see get_profile_version.
+PROFILE_CACHE = os.environ.get('PROFILE_CACHE', 'none')
+PROFILE_CACHE_SIZE = int(os.environ.get('PROFILE_CACHE_SIZE', '256'))
+PROFILE_CACHE_PATH = os.environ.get('PROFILE_CACHE_PATH', '/tmp/profile_cache.sqlite3')
+_profile_cache = None
+
+# (column name, data type) of the profile tables per schema, looked up once per container for projected requests
+_table_columns = {}
+
+# Marker column that opens each table's section in the joined row
+FOUND_COLUMN = '__found'
+
+# 'structured' returns the chemical rows as a list of objects under "ChemicalComposition",
+# 'legacy' returns each column as a comma-joined string
+CHEMICAL_FORMAT = os.environ.get('CHEMICAL_FORMAT', 'structured')
+
+LEGACY_MULTI_VALUE_COLUMNS = """
+              string_agg(CAST(id AS TEXT), ',') as ids,
+              string_agg(CAST("ChemicalPhysicalComposion" AS TEXT), ',') as "ChemicalPhysicalComposion",
+              string_agg(CAST("CAS" AS TEXT), ',') as "CAS",
+              string_agg(CAST("Typical" AS TEXT), ',') as "Typical",
+              string_agg(CAST("Min" AS TEXT), ',') as "Min",
+              string_agg(CAST("Max" AS TEXT), ',') as "Max",
+              MAX("UnitType") as "UnitType"
+"""
+
+STRUCTURED_MULTI_VALUE_COLUMNS = """
+              json_agg(json_build_object(
+                  'id', id,
+                  'ChemicalPhysicalComposion', CAST("ChemicalPhysicalComposion" AS TEXT),
+                  'CAS', CAST("CAS" AS TEXT),
+                  'Typical', CAST("Typical" AS TEXT),
+                  'Min', CAST("Min" AS TEXT),
+                  'Max', CAST("Max" AS TEXT),
+                  'UnitType', "UnitType"
+              ) ORDER BY id) as "ChemicalComposition",
+              MAX("UnitType") as "UnitType"
+"""
+
+MULTI_VALUE_COLUMNS = LEGACY_MULTI_VALUE_COLUMNS if CHEMICAL_FORMAT == 'legacy' else STRUCTURED_MULTI_VALUE_COLUMNS
 
 def lambda_handler(event, context):
    try:
+       try:
+           ids = get_batch_ids(event)
+           fields = get_projection_fields(event)
+       except ValueError as e:
+           return {'statusCode': 400, 'body': str(e)}
+       if ids is not None:
+           return batch_handler(ids, fields)
+
        if not event.get('queryStringParameters', {}).get('id'):
            return {'statusCode': 400, 'body': 'missing id parameter'}
 
        id = event['queryStringParameters']['id']
-       conn = get_db_connection()
-       cur = conn.cursor()
-       
-       # Get all tables' data
-       waste_name = get_table_data(cur, 'network', 'generator_customerprofile', id, id_param='id')
-       waste_description = get_table_data(cur, 'network', 'generator_generatingprocessandmaterialcomposition', id, id_param='CustomerProfile_id')
-       print(waste_description)
-       waste_profile = get_multi_value_table_data(cur, 'network', 'generator_wasteprofilechemical', id, id_param='GeneratingProcessAndMaterialComposition_id')
-       print(waste_profile)
-       physical_properties = get_table_data(cur, 'network', 'generator_physicalandchemicalproperties', id, id_param='CustomerProfile_id')
-       print(physical_properties)
-       regulatory_info = get_table_data(cur, 'network', 'generator_regulatoryinformation', id, id_param='CustomerProfile_id')
-       print(regulatory_info)
-       shipping_info = get_table_data(cur, 'network', 'generator_shippingandpackaginginformation', id, id_param='CustomerProfile_id')
-       print(shipping_info)
-       #frequency_info = get_table_data(cur, 'network', 'communication_pricingrequeststream', id, id_param='CustomerProfile_id')
-       #print(frequency_info)
-
-       # Combine all results
-       combined_result = {**waste_name, **waste_description, **waste_profile, **physical_properties, **regulatory_info, **shipping_info} # **frequency_info,  **epa_rcra_info, **land_ban_info}
+       cache_key = get_cache_key(SCHEMA, id, get_projection_mapper(event))
+       body, cache_status = run_with_connection(lambda cur: get_profile_body(cur, SCHEMA, id, fields, cache_key))
        
-       if combined_result:
+       if body:
            return {
                'statusCode': 200,
-               'body': json.dumps(combined_result, default=str)
+               'headers': {'X-Profile-Cache': cache_status},
+               'body': body
            }
        return {
            'statusCode': 404,
@@ -41,10 +128,287 @@ def lambda_handler(event, context):
 
    except Exception as e:
        return {'statusCode': 500, 'body': str(e)}
-   finally:
-       if 'conn' in locals():
-           cur.close()
-           conn.close()
+
+def batch_handler(ids, fields=None):
+    """
+    Returns many profiles in one response, reading each table once for all ids. Batches do
+    not go through the profile cache: they already take one query per table whatever their
+    size, serving entries would add a version probe over the same rows, and the cached bodies
+    are encoded single profiles that would have to be decoded again to build the batch body.
+    """
+    profiles = run_with_connection(lambda cur: get_profiles_batch(cur, SCHEMA, ids, get_projected_columns(cur, SCHEMA, fields)))
+    return {
+        'statusCode': 200,
+        'body': encode_body({
+            'profiles': {id: profile for id, profile in profiles.items() if profile},
+            'not_found': [id for id, profile in profiles.items() if not profile]
+        })
+    }
+
+def encode_body(value):
+    return encode_json(value) if TYPED_JSON else json.dumps(value, default=str)
+
+def get_batch_ids(event):
+    """
+    Returns the ids of a batch request, given either as ?ids=1,2,3 or as a JSON body
+    {"ids": [1, 2, 3]}, or None for a single-profile request. A body that is not a JSON
+    object, as single-profile GETs may carry, is left to the single-profile path.
+    """
+    params = event.get('queryStringParameters') or {}
+    if params.get('ids'):
+        raw_ids = params['ids'].split(',')
+    else:
+        body = event.get('body')
+        if isinstance(body, str):
+            if not body.lstrip().startswith('{'):
+                return None
+            try:
+                body = json.loads(body)
+            except json.JSONDecodeError:
+                return None
+        if not isinstance(body, dict) or body.get('ids') is None:
+            return None
+        raw_ids = body['ids']
+
+    try:
+        ids = list(dict.fromkeys(int(str(id).strip()) for id in raw_ids if str(id).strip()))
+    except (TypeError, ValueError):
+        raise ValueError('ids must be a list of integer profile ids')
+    if not ids:
+        raise ValueError('missing ids parameter')
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValueError(f'too many ids: {len(ids)} (max {MAX_BATCH_IDS})')
+    return ids
+
+def get_projection_mapper(event):
+    params = event.get('queryStringParameters') or {}
+    return params.get('projection') or PROFILE_PROJECTION
+
+def get_projection_fields(event):
+    """Returns the field manifest of the mapper named by ?projection=, or None to select every column"""
+    mapper = get_projection_mapper(event)
+    return get_manifest(mapper) if mapper else None
+
+def get_profile_cache():
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = create_profile_cache(PROFILE_CACHE, PROFILE_CACHE_SIZE, PROFILE_CACHE_PATH)
+    return _profile_cache
+
+def get_cache_key(schema, id, mapper):
+    # Settings that change the response body are part of the key, so one cache file can serve several configurations
+    return f"{schema}/{id}/{mapper or '*'}/{CHEMICAL_FORMAT}/{'typed' if TYPED_JSON else 'str'}"
+
+def get_profile_body(cur, schema, id, fields, cache_key):
+    """
+    Returns (encoded profile or None, cache status). With a profile cache configured the
+    stored body is served when its version matches the profile's current row versions, and is
+    rebuilt from the tables when it is missing ('miss') or out of date ('stale').
+    """
+    cache = get_profile_cache()
+    if cache is None:
+        combined_result = fetch_profile(cur, schema, id, fields)
+        return (encode_body(combined_result) if combined_result else None), 'off'
+
+    version = get_profile_version(cur, schema, id)
+    cached = cache.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1], 'hit'
+    status = 'miss' if cached is None else 'stale'
+
+    combined_result = fetch_profile(cur, schema, id, fields)
+    if not combined_result:
+        return None, status
+    body = encode_body(combined_result)
+    cache.put(cache_key, version, body)
+    return body, status
+
+def build_profile_version_query(schema):
+    """
+    Builds one SELECT that hashes the xmin of the rows of every table in PROFILE_TABLES for a
+    profile id. xmin is the id of the transaction that wrote a row version, so any insert,
+    update or delete in those rows changes the set, without reading or serializing the rows'
+    values. The tables have no updated-at column to take a max of, and a max xmin would miss
+    a write committed after one with a later transaction id. Only the 32-character digest is
+    sent back. A VACUUM FREEZE also changes the digest, which costs one extra miss.
+    """
+    table_versions = [
+        f"""coalesce((SELECT string_agg(t.xmin::text, ',' ORDER BY t.xmin::text) FROM {schema}.{table} t WHERE t."{id_param}" = %s), '-')"""
+        for table, id_param, _ in PROFILE_TABLES
+    ]
+    return f"SELECT md5(concat_ws('|', {', '.join(table_versions)}))"
+
+def get_profile_version(cur, schema, id):
+    execute_profile_query(cur, build_profile_version_query(schema), (id,) * len(PROFILE_TABLES))
+    return cur.fetchone()[0]
+
+def get_projected_columns(cur, schema, fields):
+    """
+    Returns {table: [columns]} with the columns of each single-row profile table that appear in
+    fields, and every text column when fields holds TEXT_COLUMNS, in table order. Returns None
+    when fields is None, meaning SELECT * everywhere.
+    """
+    if fields is None:
+        return None
+    if schema not in _table_columns:
+        cur.execute("""
+            SELECT table_name, column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = ANY(%s)
+            ORDER BY table_name, ordinal_position
+        """, (schema, [table for table, _, _ in PROFILE_TABLES]))
+        table_columns = {}
+        for table, column, data_type in cur.fetchall():
+            table_columns.setdefault(table, []).append((column, data_type))
+        _table_columns[schema] = table_columns
+
+    text_columns = TEXT_COLUMNS in fields
+    return {
+        table: [column for column, data_type in _table_columns[schema].get(table, [])
+                if column in fields or (text_columns and data_type in TEXT_DATA_TYPES)]
+        for table, _, multi_value in PROFILE_TABLES if not multi_value
+    }
+
+def quote_column(column):
+    """
+    Quotes a column name read from information_schema for a query executed with parameters,
+    so quotes in the name are doubled and so is %, which psycopg2 would take for a placeholder
+    """
+    return '"' + column.replace('"', '""').replace('%', '%%') + '"'
+
+def projected_columns_sql(columns, alias):
+    """Renders the selected columns of a table, or alias.* when the table is not projected"""
+    if columns is None:
+        return f'{alias}.*'
+    return ', '.join(f'{alias}.{quote_column(column)}' for column in columns)
+
+def fetch_profile(cur, schema, id, fields=None):
+    columns = get_projected_columns(cur, schema, fields)
+    if PROFILE_QUERY_MODE == 'join':
+        return get_profile_data_joined(cur, schema, id, columns)
+    if PROFILE_QUERY_MODE == 'parallel':
+        return get_profile_data_parallel(cur, schema, id, columns)
+    return get_profile_data(cur, schema, id, columns)
+
+def get_profile_data(cur, schema, id, columns=None):
+    """Fetches the profile one table at a time and merges the rows in PROFILE_TABLES order"""
+    combined_result = {}
+    for table, id_param, multi_value in PROFILE_TABLES:
+        combined_result.update(fetch_profile_table(cur, schema, id, table, id_param, multi_value, columns))
+    return combined_result
+
+def get_profile_data_parallel(cur, schema, id, columns=None):
+    """
+    Fetches every profile table concurrently and merges the rows in PROFILE_TABLES order.
+    The first table is read on cur; the others each run on their own reused connection slot.
+    """
+    global _parallel_executor
+    if _parallel_executor is None:
+        _parallel_executor = ThreadPoolExecutor(max_workers=len(PROFILE_TABLES) - 1, thread_name_prefix='profile-table')
+
+    futures = [
+        _parallel_executor.submit(
+            run_with_connection,
+            lambda table_cur, table_spec=table_spec: fetch_profile_table(table_cur, schema, id, *table_spec, columns),
+            slot)
+        for slot, table_spec in enumerate(PROFILE_TABLES[1:], start=1)
+    ]
+    combined_result = fetch_profile_table(cur, schema, id, *PROFILE_TABLES[0], columns)
+    for future in futures:
+        combined_result.update(future.result())
+    return combined_result
+
+def fetch_profile_table(cur, schema, id, table, id_param, multi_value, columns=None):
+    if multi_value:
+        table_data = get_multi_value_table_data(cur, schema, table, id, id_param=id_param)
+    elif columns is not None and not columns.get(table):
+        # Nothing the mapper reads lives in this table
+        return {}
+    else:
+        table_data = get_table_data(cur, schema, table, id, id_param=id_param,
+                                    columns=columns.get(table) if columns else None)
+    return table_data
+
+def get_profiles_batch(cur, schema, ids, columns=None):
+    """
+    Fetches many profiles with one query per table and groups the rows per profile id.
+    Returns {id: profile} in request order, with an empty dict for ids that were not found.
+    """
+    profiles = {id: {} for id in ids}
+    for table, id_param, multi_value in PROFILE_TABLES:
+        if not multi_value and columns is not None and not columns.get(table):
+            continue
+        get_table_data_batch(cur, schema, table, ids, profiles, id_param=id_param, multi_value=multi_value,
+                             columns=columns.get(table) if columns else None)
+    return profiles
+
+def get_profile_data_joined(cur, schema, id, columns=None):
+    """Fetches the whole profile in one round trip and merges it like get_profile_data"""
+    cur.execute(build_profile_join_query(schema, columns=columns), {'id': id})
+    columns = [desc[0] for desc in cur.description]
+    row = cur.fetchone()
+    return merge_profile_row(columns, row) if row else {}
+
+def build_profile_join_query(schema, key='%(id)s', source='(SELECT 1) AS profile_source', suffix='', columns=None):
+    """
+    Builds one SELECT that lateral-joins every table in PROFILE_TABLES on the profile id.
+
+    The first column is the profile key. Each table then contributes a section that starts
+    with a FOUND_COLUMN marker, so a missing row can be told apart from a row full of NULLs
+    when the result is merged back. By default the key is a single %(id)s parameter; the
+    export passes a scan over customer profiles as source, its id column as key and
+    a WHERE/ORDER BY suffix. columns optionally projects each table, see get_projected_columns.
+    """
+    sections = []
+    joins = []
+    for i, (table, id_param, multi_value) in enumerate(PROFILE_TABLES):
+        alias = f't{i}'
+        if multi_value:
+            subquery = f"""
+           SELECT TRUE AS "{FOUND_COLUMN}", {MULTI_VALUE_COLUMNS}
+           FROM {schema}.{table}
+           WHERE "{id_param}" = {key}
+           GROUP BY "{id_param}"
+       """
+        else:
+            select_items = [f'TRUE AS "{FOUND_COLUMN}"', projected_columns_sql(columns.get(table) if columns else None, 't')]
+            subquery = f"""
+           SELECT {', '.join(item for item in select_items if item)}
+           FROM {schema}.{table} t
+           WHERE t."{id_param}" = {key}
+           LIMIT 1
+       """
+        sections.append(f'{alias}.*')
+        joins.append(f'LEFT JOIN LATERAL ({subquery}) {alias} ON TRUE')
+
+    return f"""
+       SELECT {key} AS profile_key, {', '.join(sections)}
+       FROM {source}
+       {' '.join(joins)}
+       {suffix}
+   """
+
+def merge_profile_row(columns, row):
+    """
+    Merges the sections of a joined profile row in table order, skipping tables with no row.
+    Columns ahead of the first section, such as the profile key, are not part of the profile.
+    """
+    combined_result = {}
+    found = False
+    for column, value in zip(columns, row):
+        if column == FOUND_COLUMN:
+            found = bool(value)
+        elif found:
+            combined_result[column] = value
+    return combined_result
+
+class ProfileConnection(psycopg2.extensions.connection):
+    """Connection that remembers which profile queries are prepared on its server session"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # SQL text -> prepared statement name
+        self.prepared_statements = {}
 
 def get_db_connection():
 
@@ -55,27 +419,119 @@ def get_db_connection():
         password=os.environ['DB_PASSWORD'],
         dbname=os.environ['DB_NAME'],
         port=int(os.environ['DB_PORT']),
-        connect_timeout=5)
+        connect_timeout=5,
+        connection_factory=ProfileConnection)
+    if TYPED_JSON:
+        register_typecasters(connection)
 
     return connection
 
-def get_table_data(cursor, schema, table, id, id_param='id'):
-   sql_command = f'SELECT * FROM {schema}.{table} WHERE "{id_param}" = {id}'
-   print(sql_command)
-   cursor.execute(f'SELECT * FROM {schema}.{table} WHERE "{id_param}" = %s', (id,))
+def get_reused_connection(slot=0):
+    """
+    Returns the module-level connection of a slot, opening it on the first (cold) invocation.
+
+    A connection that has sat idle for CONNECTION_CHECK_AFTER seconds is pinged first,
+    since the RDS proxy may have dropped the session in the meantime.
+    """
+    connection = _connections.get(slot)
+    if connection is not None and not connection.closed:
+        if time.monotonic() - _connections_last_used[slot] < CONNECTION_CHECK_AFTER or is_connection_alive(connection):
+            CONNECTION_STATS['hits'] += 1
+            _connections_last_used[slot] = time.monotonic()
+            return connection
+        CONNECTION_STATS['reconnects'] += 1
+        reset_connection(slot)
+    elif connection is not None:
+        CONNECTION_STATS['reconnects'] += 1
+
+    connection = get_db_connection()
+    # Profile reads are single statements, so no transaction is left open between invocations
+    connection.autocommit = True
+    _connections[slot] = connection
+    _connections_last_used[slot] = time.monotonic()
+    CONNECTION_STATS['connects'] += 1
+    # Only on a cold start or a reconnect; warm invocations reuse the connection silently
+    print(f'Opened database connection {slot}, connection stats: {CONNECTION_STATS}')
+    return connection
+
+def is_connection_alive(connection):
+    try:
+        with connection.cursor() as cur:
+            cur.execute('SELECT 1')
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
+def reset_connection(slot=0):
+    connection = _connections.pop(slot, None)
+    if connection is not None:
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+def run_with_connection(work, slot=0):
+    """
+    Runs work(cursor) on the reused connection of a slot. If the session turns out to be dead
+    the connection is replaced and work is retried once; all profile reads are idempotent.
+    """
+    for attempt in range(2):
+        conn = get_reused_connection(slot)
+        try:
+            with conn.cursor() as cur:
+                return work(cur)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            reset_connection(slot)
+            if attempt:
+                raise
+            CONNECTION_STATS['reconnects'] += 1
+
+def execute_profile_query(cursor, sql, params):
+    """
+    Executes a profile query. With USE_PREPARED_STATEMENTS the statement is prepared on the
+    cursor's connection the first time its SQL is seen, and EXECUTEd from then on. A new
+    connection starts with no prepared statements, so they are re-prepared after a reconnect.
+    """
+    prepared = getattr(cursor.connection, 'prepared_statements', None)
+    if not USE_PREPARED_STATEMENTS or prepared is None:
+        cursor.execute(sql, params)
+        return
+
+    for attempt in range(2):
+        name = prepared.get(sql)
+        if name is None:
+            name = f'profile_query_{len(prepared) + 1}'
+            # PREPARE is executed without parameters, so psycopg2 leaves %% escapes alone
+            numbered = []
+            placeholders = 0
+            for part in re.split(r'(%%|%s)', sql):
+                if part == '%s':
+                    placeholders += 1
+                    part = f'${placeholders}'
+                elif part == '%%':
+                    part = '%'
+                numbered.append(part)
+            cursor.execute(f"PREPARE {name} AS {''.join(numbered)}")
+            prepared[sql] = name
+        try:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+            return
+        except psycopg2.errors.InvalidSqlStatementName:
+            # The session was reset behind our back (e.g. DISCARD ALL); prepare everything again
+            prepared.clear()
+            if attempt:
+                raise
+
+def get_table_data(cursor, schema, table, id, id_param='id', columns=None):
+   select_list = '*' if columns is None else projected_columns_sql(columns, 't')
+   execute_profile_query(cursor, f'SELECT {select_list} FROM {schema}.{table} t WHERE "{id_param}" = %s', (id,))
    columns = [desc[0] for desc in cursor.description]
    row = cursor.fetchone()
    return dict(zip(columns, row)) if row else {}
 
 def get_multi_value_table_data(cursor, schema, table, id, id_param='id'):
-   cursor.execute(f"""
-       SELECT string_agg(CAST(id AS TEXT), ',') as ids,
-              string_agg(CAST("ChemicalPhysicalComposion" AS TEXT), ',') as "ChemicalPhysicalComposion",
-              string_agg(CAST("CAS" AS TEXT), ',') as "CAS",
-              string_agg(CAST("Typical" AS TEXT), ',') as "Typical",
-              string_agg(CAST("Min" AS TEXT), ',') as "Min",
-              string_agg(CAST("Max" AS TEXT), ',') as "Max",
-              MAX("UnitType") as "UnitType"
+   execute_profile_query(cursor, f"""
+       SELECT {MULTI_VALUE_COLUMNS}
        FROM {schema}.{table}
        WHERE "{id_param}" = %s
        GROUP BY "{id_param}"
@@ -83,4 +539,25 @@ def get_multi_value_table_data(cursor, schema, table, id, id_param='id'):
    
    columns = [desc[0] for desc in cursor.description]
    row = cursor.fetchone()
-   return dict(zip(columns, row)) if row else {}
\ No newline at end of file
+   return dict(zip(columns, row)) if row else {}
+
+def get_table_data_batch(cursor, schema, table, ids, profiles, id_param='id', multi_value=False, columns=None):
+   """Merges the rows of one table for all ids into profiles, keeping the first row per id like fetchone()"""
+   if multi_value:
+       execute_profile_query(cursor, f"""
+           SELECT "{id_param}" AS profile_key, {MULTI_VALUE_COLUMNS}
+           FROM {schema}.{table}
+           WHERE "{id_param}" = ANY(%s)
+           GROUP BY "{id_param}"
+       """, (ids,))
+   else:
+       select_items = [f't."{id_param}" AS profile_key', projected_columns_sql(columns, 't')]
+       execute_profile_query(cursor, f'SELECT {", ".join(item for item in select_items if item)} FROM {schema}.{table} t WHERE t."{id_param}" = ANY(%s)', (ids,))
+
+   columns = [desc[0] for desc in cursor.description][1:]
+   merged = set()
+   for row in cursor:
+       if row[0] in merged:
+           continue
+       merged.add(row[0])
+       profiles[row[0]].update(zip(columns, row[1:]))
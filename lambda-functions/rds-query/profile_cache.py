@@ -0,0 +1,86 @@
+"""
+Caches of encoded profile bodies for the rds-query lambda.
+
+Entries are stored as key -> (version, body), where version is a digest of the profile's
+row versions (see get_profile_version) at the time the body was built. The lambda probes
+the current version before serving an entry, so a cache never returns a profile that has
+changed since it was stored.
+
+Backends:
+    memory  an LRU dict in the container, shared by warm invocations
+    sqlite  a SQLite file (by default in the Lambda's /tmp), kept across container restarts
+            when the path is on persistent storage
+"""
+import sqlite3
+import time
+from collections import OrderedDict
+
+
+class MemoryProfileCache:
+    """In-process LRU of at most maxsize profile bodies"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, version, body):
+        self._entries[key] = (version, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteProfileCache:
+    """Profile bodies in a local SQLite file, evicting the least recently used above maxsize"""
+
+    def __init__(self, path, maxsize):
+        self.maxsize = maxsize
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS profile_cache (
+                key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                body TEXT NOT NULL,
+                used REAL NOT NULL
+            )
+        """)
+        self._db.execute('CREATE INDEX IF NOT EXISTS profile_cache_used ON profile_cache (used)')
+
+    def get(self, key):
+        row = self._db.execute('SELECT version, body FROM profile_cache WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            self._db.execute('UPDATE profile_cache SET used = ? WHERE key = ?', (time.time(), key))
+        return row
+
+    def put(self, key, version, body):
+        self._db.execute('INSERT OR REPLACE INTO profile_cache (key, version, body, used) VALUES (?, ?, ?, ?)',
+                         (key, version, body, time.time()))
+        self._db.execute("""
+            DELETE FROM profile_cache WHERE key IN (
+                SELECT key FROM profile_cache ORDER BY used DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.maxsize,))
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM profile_cache').fetchone()[0]
+
+
+def create_profile_cache(backend, maxsize, path):
+    """Returns the cache for a PROFILE_CACHE setting, or None when caching is off"""
+    if backend == 'none':
+        return None
+    if backend == 'memory':
+        return MemoryProfileCache(maxsize)
+    if backend == 'sqlite':
+        return SQLiteProfileCache(path, maxsize)
+    raise ValueError(f'Unknown profile cache backend: {backend}')
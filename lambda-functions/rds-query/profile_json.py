@@ -0,0 +1,78 @@
+"""
+JSON-ready typecasting and encoding for rds-query responses.
+
+Typecasters registered on a connection turn date/time values into ISO 8601 strings as rows
+are read, so the response body is encoded in one pass without a per-value default=
+fallback. orjson is used when it is installed.
+
+NUMERIC values are returned as their decimal text, exactly as json.dumps(default=str)
+wrote psycopg2's Decimals, since the mappers read them as strings ("300.50" stays "300.50").
+NaN and Infinity, in NUMERIC and in float columns, are returned as text as well: json.dumps
+would write them as the invalid JSON tokens NaN and Infinity.
+"""
+import datetime
+import decimal
+import json
+import math
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+NUMERIC_OIDS = (1700,)
+FLOAT_OIDS = (700, 701)
+TIMESTAMP_OIDS = (1114, 1184)
+DATE_TIME_OIDS = (1082, 1083, 1266)
+
+
+def cast_numeric(value, cur):
+    return None if value is None else str(decimal.Decimal(value))
+
+
+def cast_float(value, cur):
+    if value is None:
+        return None
+    number = float(value)
+    return number if math.isfinite(number) else value
+
+
+def cast_timestamp(value, cur):
+    # Postgres' ISO DateStyle separates date and time with a space
+    return None if value is None else value.replace(' ', 'T', 1)
+
+
+def cast_iso_text(value, cur):
+    return value
+
+
+def register_typecasters(connection):
+    """Registers the JSON-ready typecasters on a single connection"""
+    # Imported here so the encoder can be used (and benchmarked) without the compiled driver
+    from psycopg2.extensions import new_type, register_type
+
+    register_type(new_type(NUMERIC_OIDS, 'PROFILE_NUMERIC', cast_numeric), connection)
+    register_type(new_type(FLOAT_OIDS, 'PROFILE_FLOAT', cast_float), connection)
+    register_type(new_type(TIMESTAMP_OIDS, 'PROFILE_TIMESTAMP', cast_timestamp), connection)
+    register_type(new_type(DATE_TIME_OIDS, 'PROFILE_DATE_TIME', cast_iso_text), connection)
+
+
+def json_default(value):
+    """Fallback for values that did not come through the typecasters"""
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, memoryview):
+        return value.tobytes().decode('utf-8', errors='replace')
+    return str(value)
+
+
+def encode_json(value):
+    """Encodes a response body, through orjson when it is available"""
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(value, default=json_default)
@@ -0,0 +1,51 @@
+"""
+Puts the lambda directories on sys.path, as each lambda imports its modules top-level.
+
+The mapping lambda comes first. rds-query is appended, so an installed psycopg2 is used
+before the copy vendored for the Lambda runtime. Its handler shares the module name
+lambda_function with the mapping lambda's, so it is loaded by path (see rds_query).
+"""
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+TRADEBE_DIR = os.path.join(ROOT, 'lambda-functions', 'portal-automation-tradebe')
+RDS_QUERY_DIR = os.path.join(ROOT, 'lambda-functions', 'rds-query')
+SAMPLE = os.path.join(ROOT, 'WASTELINQ-Portal-Automation', 'sample_data', 'sample_pulled_data.json')
+
+sys.path.insert(0, TRADEBE_DIR)
+sys.path.append(RDS_QUERY_DIR)
+
+
+@pytest.fixture(scope='session')
+def rds_query():
+    """The rds-query lambda_function module"""
+    pytest.importorskip('psycopg2')
+    spec = importlib.util.spec_from_file_location('rds_query_lambda_function',
+                                                  os.path.join(RDS_QUERY_DIR, 'lambda_function.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def sample_profile():
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def map_request(monkeypatch):
+    """Calls the mapping lambda with a fresh memory cache, returning (status, headers, body)"""
+    import lambda_function
+    monkeypatch.setattr(lambda_function, 'MAPPING_CACHE', 'memory')
+    monkeypatch.setattr(lambda_function, '_mapping_cache', None)
+
+    def map_request(body):
+        response = lambda_function.lambda_handler({'body': json.dumps(body)}, None)
+        return response['statusCode'], response['headers'], json.loads(response['body'])
+    return map_request
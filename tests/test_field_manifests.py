@@ -0,0 +1,70 @@
+"""
+Every profile field a portal mapper reads has to be in that mapper's field manifest, or a
+projected rds-query request would silently leave it out.
+"""
+import pytest
+
+from field_manifests import FIELD_MANIFESTS, TEXT_COLUMNS
+from field_rules import WHOLE_PROFILE
+from mapper_factory import MapperFactory
+from tradebe_field_rules import CHEMICAL_COMPOSITION_FIELDS
+
+
+class RecordingProfile(dict):
+    """A profile dict that records the keys read from it, and whether all of it was iterated"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.keys_read = set()
+        self.iterated = False
+
+    def __getitem__(self, key):
+        self.keys_read.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.keys_read.add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.keys_read.add(key)
+        return super().__contains__(key)
+
+    def items(self):
+        self.iterated = True
+        return super().items()
+
+    def values(self):
+        self.iterated = True
+        return super().values()
+
+
+def manifest_covers(manifest, field):
+    # The chemical composition aggregate is returned whatever the projection
+    return field in manifest or field in CHEMICAL_COMPOSITION_FIELDS
+
+
+@pytest.mark.parametrize('portal', MapperFactory.available_portals())
+def test_every_mapper_has_a_manifest(portal):
+    assert portal in FIELD_MANIFESTS
+
+
+@pytest.mark.parametrize('portal', MapperFactory.available_portals())
+def test_fields_read_while_mapping_are_in_the_manifest(portal, sample_profile):
+    profile = RecordingProfile(sample_profile)
+    MapperFactory.get_mapper(portal).map_profile(profile)
+
+    manifest = FIELD_MANIFESTS[portal]
+    assert sorted(field for field in profile.keys_read if not manifest_covers(manifest, field)) == []
+    if profile.iterated:
+        assert TEXT_COLUMNS in manifest
+
+
+@pytest.mark.parametrize('portal', MapperFactory.available_portals())
+def test_declared_rule_reads_are_in_the_manifest(portal):
+    manifest = FIELD_MANIFESTS[portal]
+    dependencies = getattr(MapperFactory.get_mapper(portal), 'field_dependencies', {})
+    reads = set().union(*dependencies.values()) if dependencies else set()
+    if WHOLE_PROFILE in reads:
+        assert TEXT_COLUMNS in manifest
+    assert sorted(field for field in reads - {WHOLE_PROFILE} if not manifest_covers(manifest, field)) == []
@@ -0,0 +1,96 @@
+"""
+A fields / sections selection evaluates only the selected rules, so it has to return exactly
+those elements of the full mapping, and reject requests that do not name form elements.
+"""
+import json
+import random
+
+import pytest
+
+from field_rules import SelectionError
+from portal_definitions import get_section_ids, load_portal_definition
+from tradebe_field_rules import CHEMICAL_COMPOSITION_SECTION, TRADEBE_FIELD_RULES, TRADEBE_FORM_DEFINITION
+from tradebe_mapper import TradebeProfileMapper, chemical_row_ids
+
+SECTION_IDS = get_section_ids(load_portal_definition(TRADEBE_FORM_DEFINITION))
+CHEMICAL_ROWS = [
+    {'ChemicalPhysicalComposion': 'Nitric acid', 'CAS': '7697-37-2', 'Min': '10', 'Max': '20'},
+    {'ChemicalPhysicalComposion': 'Water', 'CAS': '7732-18-5', 'Min': '80', 'Max': '90'},
+]
+
+
+@pytest.fixture(scope='module')
+def mapper():
+    return TradebeProfileMapper()
+
+
+def chemical_ids(mapping):
+    rows = TradebeProfileMapper().count_table_rows(mapping)
+    return {element_id for row in range(rows) for element_id in chemical_row_ids(row)}
+
+
+def test_sections_cover_the_full_mapping(mapper, sample_profile):
+    profile = dict(sample_profile, ChemicalComposition=CHEMICAL_ROWS)
+    full = mapper.map_profile(profile)
+    mapped = {}
+    for section in list(SECTION_IDS) + [CHEMICAL_COMPOSITION_SECTION]:
+        selected = mapper.map_profile(profile, sections=[section])
+        assert selected == {element_id: full[element_id] for element_id in selected}
+        assert mapped.keys().isdisjoint(selected)
+        mapped.update(selected)
+    assert mapped == full
+
+
+@pytest.mark.parametrize('section', SECTION_IDS)
+def test_section_maps_its_form_elements(mapper, sample_profile, section):
+    selected = mapper.map_profile(sample_profile, sections=[section])
+    assert set(SECTION_IDS[section]) & set(TRADEBE_FIELD_RULES) <= set(selected)
+
+
+def test_chemical_composition_section(mapper, sample_profile):
+    profile = dict(sample_profile, ChemicalComposition=CHEMICAL_ROWS)
+    full = mapper.map_profile(profile)
+    selected = mapper.map_profile(profile, sections=[CHEMICAL_COMPOSITION_SECTION])
+    assert set(selected) == chemical_ids(full) and len(selected) == 8
+    assert selected == {element_id: full[element_id] for element_id in selected}
+
+
+def test_field_selections(mapper, sample_profile):
+    rng = random.Random(0)
+    full = mapper.map_profile(sample_profile)
+    for _ in range(200):
+        fields = rng.sample(sorted(TRADEBE_FIELD_RULES), rng.randint(1, 8))
+        sections = rng.sample(sorted(SECTION_IDS), rng.randint(0, 2))
+        selected = mapper.map_profile(sample_profile, fields, sections)
+        expected = set(fields).union(*(SECTION_IDS[section] for section in sections)) & set(TRADEBE_FIELD_RULES)
+        assert set(selected) >= expected
+        assert selected == {element_id: full[element_id] for element_id in selected}
+
+
+@pytest.mark.parametrize('fields, sections, message', [
+    (['no-such-element'], None, 'Unknown field ids: no-such-element'),
+    (None, ['No_Such_Section'], 'Unknown form section'),
+    (None, ['Waste_'], 'Ambiguous form section: Waste_ matches Waste_Stream, Waste_Characteristics'),
+])
+def test_invalid_selection(mapper, sample_profile, fields, sections, message):
+    with pytest.raises(SelectionError, match=message):
+        mapper.map_profile(sample_profile, fields, sections)
+
+
+@pytest.mark.parametrize('selection', [{'targetFields': ['no-such-element']}, {'targetSections': ['Waste_']}])
+def test_invalid_selection_is_a_bad_request(map_request, sample_profile, selection):
+    status, _, body = map_request(dict(sample_profile, targetPortal='tradebe', **selection))
+    assert status == 400
+    assert body['error']
+
+
+def test_fields_without_a_rule_are_reported(map_request, sample_profile):
+    without_rule = [element_id for element_id in SECTION_IDS['Waste_Stream'] if element_id not in TRADEBE_FIELD_RULES]
+    with_rule = [element_id for element_id in SECTION_IDS['Waste_Stream'] if element_id in TRADEBE_FIELD_RULES]
+    request = dict(sample_profile, targetPortal='tradebe', targetFields=without_rule[:2] + with_rule[:1])
+
+    for cache_status in ('miss', 'hit'):
+        status, headers, body = map_request(request)
+        assert status == 200 and headers['X-Mapping-Cache'] == cache_status
+        assert json.loads(headers['X-Unmapped-Fields']) == without_rule[:2]
+        assert list(body) == with_rule[:1]
@@ -0,0 +1,45 @@
+"""
+Without pyahocorasick TermMatcher searches for every term on its own, and has to find the
+same categories as the automaton.
+"""
+import random
+
+import pytest
+
+import hazard_terms
+import tradebe_mapper
+from hazard_terms import HAZARD_TERMS, TermMatcher
+from tradebe_mapper import TradebeProfileMapper
+
+
+@pytest.fixture
+def substring_matcher(monkeypatch):
+    monkeypatch.setattr(hazard_terms, 'ahocorasick', None)
+    return TermMatcher(HAZARD_TERMS)
+
+
+def random_texts(count, seed):
+    """Filler text with terms, parts of terms and overlapping terms spliced in"""
+    rng = random.Random(seed)
+    terms = [term.lower() for terms in HAZARD_TERMS.values() for term in terms]
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(0, 6)):
+            term = rng.choice(terms)
+            parts.append(rng.choice([term, term[:-1], term[1:], term + term[-3:], 'no ' + term]))
+            parts.append(rng.choice(['', ' ', 'waste ', ', ', 'mixed with ']))
+        texts.append(''.join(parts))
+    return texts
+
+
+def test_substring_scan_matches_the_automaton(substring_matcher):
+    pytest.importorskip('ahocorasick')
+    for text in random_texts(2000, seed=0):
+        assert substring_matcher.scan(text) == hazard_terms.HAZARD_TERM_MATCHER.scan(text), text
+
+
+def test_mapping_with_substring_scan(substring_matcher, sample_profile, monkeypatch):
+    expected = TradebeProfileMapper().map_profile(sample_profile)
+    monkeypatch.setattr(tradebe_mapper, 'HAZARD_TERM_MATCHER', substring_matcher)
+    assert TradebeProfileMapper().map_profile(sample_profile) == expected
@@ -0,0 +1,68 @@
+"""
+map_profiles shares the compiled rules and term matchers across a batch, and has to map
+every profile exactly as map_profile does.
+"""
+import random
+
+from tradebe_field_rules import TRADEBE_FIELD_RULES
+from tradebe_mapper import TradebeProfileMapper
+
+
+def random_number(rng, low, high):
+    return rng.choice([str(rng.randint(low, high)), f'{rng.uniform(low, high):.1f}', 'unknown', '', None])
+
+
+def build_variants(sample, count, seed):
+    """Copies of the sample with random values in every lookup and range binned field"""
+    rng = random.Random(seed)
+    lookups = [spec for spec in TRADEBE_FIELD_RULES.values() if spec['kind'] == 'lookup']
+    ranges = [spec for spec in TRADEBE_FIELD_RULES.values() if spec['kind'] == 'range_bin']
+    profiles = []
+    for _ in range(count):
+        profile = dict(sample)
+        for spec in lookups:
+            profile[spec['field']] = rng.choice(list(spec['table']) + ['Other', '', None])
+        for spec in ranges:
+            profile[spec['field']] = rng.choice(list(spec['standard']) + [spec['custom_trigger']] * 2 + ['N/A', ''])
+            profile[spec['custom_field']] = random_number(rng, 0, 300)
+        profile['PCPViscosity'] = rng.choice(['', None, 'Other', '>500', '101-500', '1 - 100',
+                                              str(rng.randint(1, 5000)), 'thick'])
+        profile['TransContainer_PortableToteTank'] = rng.choice([True, False, 'TRUE'])
+        profile['TransContainer_PortToteTankSize'] = random_number(rng, 100, 600)
+        profiles.append(profile)
+    return profiles
+
+
+def map_one_by_one(profiles):
+    mapper = TradebeProfileMapper()
+    results = []
+    for data in profiles:
+        try:
+            results.append((list(mapper.map_profile(data).items()), None))
+        except Exception as e:
+            results.append((None, f'{type(e).__name__}: {e}'))
+    return results
+
+
+def test_sample_profile(sample_profile):
+    [result] = TradebeProfileMapper().map_profiles([sample_profile])
+    assert result.error is None
+    assert list(result.mapping.items()) == list(TradebeProfileMapper().map_profile(sample_profile).items())
+
+
+def test_variants(sample_profile):
+    profiles = build_variants(sample_profile, 500, seed=0)
+    results = list(TradebeProfileMapper().map_profiles(profiles))
+
+    assert [result.index for result in results] == list(range(len(profiles)))
+    assert [(result.mapping and list(result.mapping.items()), result.error)
+            for result in results] == map_one_by_one(profiles)
+
+
+def test_failed_profile_does_not_stop_the_batch(sample_profile):
+    profiles = [sample_profile, 'not a profile', dict(sample_profile, PCpH='Custom', pc_ph_radio_plus_option='3')]
+    results = list(TradebeProfileMapper().map_profiles(profiles))
+
+    assert results[1].mapping is None and results[1].error
+    assert [list(results[0].mapping.items()), list(results[2].mapping.items())] == \
+        [mapping for mapping, _ in map_one_by_one(profiles[::2])]
@@ -0,0 +1,40 @@
+import json
+
+import lambda_function
+
+
+def test_cache_hit_reports_the_schema_violations(map_request, sample_profile):
+    request = dict(sample_profile, targetPortal='tradebe')
+    status, miss_headers, miss_body = map_request(request)
+    assert status == 200 and miss_headers['X-Mapping-Cache'] == 'miss'
+    assert json.loads(miss_headers['X-Schema-Violations'])
+
+    status, hit_headers, hit_body = map_request(request)
+    assert status == 200 and hit_headers['X-Mapping-Cache'] == 'hit'
+    assert hit_headers['X-Schema-Violations'] == miss_headers['X-Schema-Violations']
+    assert hit_body == miss_body
+
+
+def test_unreadable_form_definition_fails_the_request(map_request, sample_profile, monkeypatch):
+    def missing_definition(filename):
+        raise FileNotFoundError(f'No such file: {filename}')
+    monkeypatch.setattr(lambda_function, 'get_portal_schema', missing_definition)
+
+    status, _, body = map_request(dict(sample_profile, targetPortal='tradebe'))
+    assert status == 500
+    assert 'Tradebe_v2.json' in body['error']
+
+
+def test_fill_plan(map_request, sample_profile):
+    status, headers, body = map_request(dict(sample_profile, targetPortal='tradebe', fillPlan=True))
+    assert status == 200 and headers['X-Fill-Plan'] == 'compiled'
+    assert isinstance(body['actions'], list)
+
+
+def test_fill_plan_without_a_form_definition_returns_the_mapping(map_request, sample_profile, monkeypatch):
+    monkeypatch.setattr(lambda_function, 'get_form_schema', lambda mapper: None)
+
+    status, headers, body = map_request(dict(sample_profile, targetPortal='tradebe', fillPlan=True))
+    assert status == 200 and headers['X-Fill-Plan'] == 'unavailable'
+    _, _, mapping = map_request(dict(sample_profile, targetPortal='tradebe'))
+    assert body == mapping
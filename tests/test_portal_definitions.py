@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from mapper_factory import MapperFactory
+from portal_definitions import PORTAL_DEFINITIONS_DIR
+
+EXTENSION_PORTALS_DIR = os.path.join(os.path.dirname(__file__), '..', 'WASTELINQ-Portal-Automation', 'portals')
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('portal', MapperFactory.available_portals())
+def test_form_definition_is_deployed_with_the_lambda(portal):
+    filename = MapperFactory.get_mapper(portal).form_definition
+    if filename is None:
+        pytest.skip(f'{portal} has no form definition')
+    assert os.path.isfile(os.path.join(PORTAL_DEFINITIONS_DIR, filename))
+
+
+@pytest.mark.parametrize('filename', sorted(os.listdir(PORTAL_DEFINITIONS_DIR)))
+def test_deployed_definition_matches_the_extension(filename):
+    assert read_bytes(os.path.join(PORTAL_DEFINITIONS_DIR, filename)) == \
+        read_bytes(os.path.join(EXTENSION_PORTALS_DIR, filename))
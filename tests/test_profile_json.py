@@ -0,0 +1,47 @@
+import decimal
+import json
+
+import pytest
+
+import profile_json
+
+NUMERIC_TEXTS = ['300.50', '42', '-7', '0.25', '5000.00', '0.0000001', '1e3', 'NaN', 'Infinity', '-Infinity']
+
+
+def reject_constant(name):
+    raise ValueError(f'invalid JSON constant {name}')
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def encoder(request, monkeypatch):
+    if request.param == 'orjson':
+        if profile_json.orjson is None:
+            pytest.skip('orjson is not installed')
+    else:
+        monkeypatch.setattr(profile_json, 'orjson', None)
+    return profile_json.encode_json
+
+
+@pytest.mark.parametrize('text', NUMERIC_TEXTS)
+def test_numeric_encodes_like_str_of_decimal(encoder, text):
+    # What the handler returned before the typecasters: psycopg2's Decimal through json.dumps(default=str)
+    expected = json.dumps({'value': decimal.Decimal(text)}, default=str)
+    assert json.loads(encoder({'value': profile_json.cast_numeric(text, None)})) == json.loads(expected)
+
+
+def test_numeric_keeps_its_text():
+    assert profile_json.cast_numeric('300.50', None) == '300.50'
+    assert profile_json.cast_numeric(None, None) is None
+
+
+@pytest.mark.parametrize('text, value', [('1.5', 1.5), ('-2', -2.0), ('NaN', 'NaN'), ('Infinity', 'Infinity'),
+                                         ('-Infinity', '-Infinity'), (None, None)])
+def test_float_cast(text, value):
+    assert profile_json.cast_float(text, None) == value
+
+
+@pytest.mark.parametrize('text', ['NaN', 'Infinity', '-Infinity'])
+def test_non_finite_values_encode_as_valid_json(encoder, text):
+    body = encoder({'numeric': profile_json.cast_numeric(text, None), 'float': profile_json.cast_float(text, None),
+                    'decimal': decimal.Decimal(text)})
+    assert json.loads(body, parse_constant=reject_constant) == {'numeric': text, 'float': text, 'decimal': text}
@@ -0,0 +1,38 @@
+"""
+Projected column names come from information_schema and are pasted into the profile queries,
+so names with quotes or % have to select the column, with and without prepared statements.
+Needs the profile database of DB_PROXY, DB_USER, DB_PASSWORD, DB_NAME and DB_PORT.
+"""
+import os
+
+import pytest
+
+COLUMNS = ['pH', 'Total Halogens %', 'Solids %s', 'Say "%(id)s"']
+
+
+@pytest.fixture
+def cursor(rds_query):
+    if 'DB_PROXY' not in os.environ:
+        pytest.skip('no profile database configured')
+    connection = rds_query.get_db_connection()
+    with connection.cursor() as cur:
+        cur.execute('CREATE TEMPORARY TABLE profile_projection (id integer, "pH" text, "Total Halogens %" text, '
+                    '"Solids %s" text, "Say ""%(id)s""" text, other text)')
+        cur.execute('INSERT INTO profile_projection VALUES (1, %s, %s, %s, %s, %s), (2, %s, %s, %s, %s, %s)',
+                    ['7', '0.5', '12', 'quoted', 'x', '8', '1.5', '13', 'quoted too', 'y'])
+        yield cur
+    connection.close()
+
+
+@pytest.mark.parametrize('prepared', [False, True])
+def test_columns_with_quotes_and_percent_signs(rds_query, cursor, monkeypatch, prepared):
+    monkeypatch.setattr(rds_query, 'USE_PREPARED_STATEMENTS', prepared)
+    for _ in range(2):
+        assert rds_query.get_table_data(cursor, 'pg_temp', 'profile_projection', 1, columns=COLUMNS) == \
+            dict(zip(COLUMNS, ['7', '0.5', '12', 'quoted']))
+
+        profiles = {1: {}, 2: {}}
+        rds_query.get_table_data_batch(cursor, 'pg_temp', 'profile_projection', [1, 2], profiles, columns=COLUMNS)
+        assert profiles == {1: dict(zip(COLUMNS, ['7', '0.5', '12', 'quoted'])),
+                            2: dict(zip(COLUMNS, ['8', '1.5', '13', 'quoted too']))}
+    assert len(cursor.connection.prepared_statements) == (2 if prepared else 0)
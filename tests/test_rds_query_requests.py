@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.mark.parametrize('event, ids', [
+    ({'queryStringParameters': {'ids': '3, 1,3'}}, [3, 1]),
+    ({'body': '{"ids": [5, "6"]}'}, [5, 6]),
+    ({'body': {'ids': [7]}}, [7]),
+])
+def test_batch_ids(rds_query, event, ids):
+    assert rds_query.get_batch_ids(event) == ids
+
+
+@pytest.mark.parametrize('body', [None, '', 'not json', '  plain text {', '{not json', '[1, 2]', '{"id": 1}'])
+def test_single_profile_request_is_not_a_batch(rds_query, body):
+    assert rds_query.get_batch_ids({'queryStringParameters': {'id': '1'}, 'body': body}) is None
+
+
+@pytest.mark.parametrize('event, message', [
+    ({'queryStringParameters': {'ids': 'a,b'}}, 'ids must be a list of integer profile ids'),
+    ({'body': '{"ids": []}'}, 'missing ids parameter'),
+])
+def test_invalid_batch_ids(rds_query, event, message):
+    with pytest.raises(ValueError, match=message):
+        rds_query.get_batch_ids(event)
@@ -0,0 +1,84 @@
+"""
+remap recomputes only the elements whose rules read a changed field, so after any edit it
+has to return exactly what mapping the edited profile from scratch returns.
+"""
+import random
+
+import pytest
+
+from field_rules import WHOLE_PROFILE
+from tradebe_field_rules import CHEMICAL_COMPOSITION_FIELDS
+from tradebe_mapper import TradebeProfileMapper
+
+# Values that switch rules onto their other branches
+EDIT_VALUES = ['', None, True, 'Yes', 'No', 'TRUE', 'Custom', 'Actual', '12.5', '73', '> 10,000', 'Wastewater',
+               'Bulk Liquid', 'hydrofluoric acid', 'contains F006 sludge', 'PFAS', 'methylene chloride',
+               'UN1993, Waste Flammable liquid, n.o.s. (Acetone, Xylene), 3, PG II, DOT-SP 12345',
+               'RQ, UN3082, (Lead), 9, PG III', '55 G', '300', '101-500', 'hexavalent chromium, EDTA']
+
+CHEMICAL_ROWS = [
+    [],
+    [{'ChemicalPhysicalComposion': 'Acetone ', 'CAS': '67-64-1', 'Min': '1', 'Max': '5'}],
+    [{'ChemicalPhysicalComposion': 'Nitric acid', 'CAS': '7697-37-2', 'Min': '10', 'Max': '20'},
+     {'ChemicalPhysicalComposion': 'Water', 'CAS': '7732-18-5', 'Min': '80', 'Max': '90'}],
+]
+
+
+@pytest.fixture(scope='module')
+def mapper():
+    return TradebeProfileMapper()
+
+
+def edited_fields(mapper, sample):
+    read_fields = {field for reads in mapper.field_dependencies.values() for field in reads} - {WHOLE_PROFILE}
+    return sorted((set(sample) | read_fields) - set(CHEMICAL_COMPOSITION_FIELDS))
+
+
+def full_mapping(mapper, data):
+    try:
+        return list(mapper.map_profile(data).items())
+    except Exception:
+        # An edit the mapper rejects, e.g. a boolean viscosity
+        return None
+
+
+def test_single_field_edits(mapper, sample_profile):
+    rng = random.Random(0)
+    previous = mapper.map_profile(sample_profile)
+    mismatched = []
+    for field in edited_fields(mapper, sample_profile):
+        for value in rng.sample(EDIT_VALUES, 4) + [KeyError]:
+            edited = dict(sample_profile)
+            if value is KeyError:
+                edited.pop(field, None)
+            else:
+                edited[field] = value
+            expected = full_mapping(mapper, edited)
+            if expected is not None and list(mapper.remap(previous, [field], edited).items()) != expected:
+                mismatched.append((field, value))
+    assert mismatched == []
+
+
+@pytest.mark.parametrize('rows', CHEMICAL_ROWS)
+def test_chemical_composition_edits(mapper, sample_profile, rows):
+    previous = mapper.map_profile(sample_profile)
+    edited = dict(sample_profile, ChemicalComposition=rows)
+    assert list(mapper.remap(previous, ['ChemicalComposition'], edited).items()) == full_mapping(mapper, edited)
+
+
+def test_chained_edits(mapper, sample_profile):
+    rng = random.Random(1)
+    fields = edited_fields(mapper, sample_profile) + ['ChemicalComposition']
+    data = dict(sample_profile)
+    output = mapper.map_profile(data)
+    for _ in range(300):
+        edited = dict(data)
+        changed = rng.sample(fields, rng.choice([1, 1, 2, 3]))
+        for field in changed:
+            edited[field] = rng.choice(CHEMICAL_ROWS) if field == 'ChemicalComposition' else rng.choice(EDIT_VALUES)
+        expected = full_mapping(mapper, edited)
+        if expected is None:
+            continue
+        output = mapper.remap(output, changed, edited)
+        assert list(output.items()) == expected, changed
+        data = edited
@@ -0,0 +1,148 @@
+"""
+The Tradebe mapper's RCRA waste code extraction, checked against a reference written
+without waste_codes: a character scan of each field value for code-shaped tokens, and the
+generator's declared codes read field by field.
+"""
+import json
+import random
+import string
+
+import pytest
+
+from tradebe_mapper import TradebeProfileMapper
+from waste_codes import RCRA_WASTE_CODES, find_waste_codes, get_declared_waste_codes
+
+LISTING_LETTERS = 'DFKPU'
+
+
+def scan_value(text):
+    """Code-shaped tokens in text: a listing letter and three digits, not preceded by a letter
+    or digit and not followed by a digit"""
+    found = set()
+    for i in range(len(text) - 3):
+        letter, digits = text[i].upper(), text[i + 1:i + 4]
+        if letter not in LISTING_LETTERS or not all(c in string.digits for c in digits):
+            continue
+        if i > 0 and (text[i - 1] in string.ascii_letters or text[i - 1] in string.digits):
+            continue
+        if i + 4 < len(text) and text[i + 4] in string.digits:
+            continue
+        found.add(letter + digits)
+    return found
+
+
+def listed_codes(value, letter):
+    if not value:
+        return set()
+    codes = set()
+    for part in str(value).split(','):
+        code = part.strip().upper()
+        if len(code) == 4 and code[0] == letter and code[1:].isdigit():
+            codes.add(code)
+    return codes
+
+
+def expected_waste_codes(data):
+    codes = set()
+    for value in data.values():
+        if value is not None:
+            codes |= scan_value(str(value)) & RCRA_WASTE_CODES
+    for field, code in (('WCHazardousIgnitable', 'D001'), ('WCHazardousCorrosive', 'D002'),
+                        ('WCHazardousReactive', 'D003'), ('WCHazardousToxic', 'D004')):
+        if data.get(field) == 'Yes':
+            codes.add(code)
+    if data.get('WCHazardousF') == 'Yes':
+        codes |= listed_codes(data.get('hazardouswastenof'), 'F')
+    if data.get('WCHazardousK') == 'Yes':
+        codes |= listed_codes(data.get('hazardouswastenoK'), 'K')
+    if data.get('WCHazardousP') == 'Yes':
+        codes |= listed_codes(data.get('hazardouswastenoP'), 'P')
+    if data.get('WCHazardousU') == 'Yes':
+        codes |= listed_codes(data.get('hazardouswastenoU'), 'U')
+        codes |= listed_codes(data.get('hazardouswastenou'), 'U')
+    if data.get('StateWasteCode'):
+        codes.add(data['StateWasteCode'])
+    return sorted(codes)
+
+
+def random_text(rng, codes):
+    pieces = []
+    for _ in range(rng.randint(0, 6)):
+        choice = rng.random()
+        if choice < 0.4:
+            code = rng.choice(codes)
+            pieces.append(code.lower() if rng.random() < 0.3 else code)
+        elif choice < 0.6:
+            pieces.append(rng.choice(LISTING_LETTERS + 'dfkpuxz') + ''.join(rng.choices(string.digits, k=rng.randint(2, 5))))
+        else:
+            pieces.append(''.join(rng.choices(string.ascii_letters + string.digits, k=rng.randint(1, 6))))
+    separators = [' ', ', ', '/', '(', ')', '-', '', '', ';']
+    return ''.join(piece + rng.choice(separators) for piece in pieces)
+
+
+def random_profile(rng):
+    codes = sorted(RCRA_WASTE_CODES)
+    profile = {f'Text_{i}': random_text(rng, codes) for i in range(rng.randint(1, 5))}
+    profile['Count'] = rng.choice([None, 5, 1.5, True])
+    for field in ('WCHazardousIgnitable', 'WCHazardousCorrosive', 'WCHazardousReactive', 'WCHazardousToxic',
+                  'WCHazardousF', 'WCHazardousK', 'WCHazardousP', 'WCHazardousU'):
+        profile[field] = rng.choice(['Yes', 'No', None])
+    for field in ('hazardouswastenof', 'hazardouswastenoK', 'hazardouswastenoP', 'hazardouswastenoU',
+                  'hazardouswastenou'):
+        profile[field] = ','.join(rng.choice(codes + ['U999', ' f001 ', 'bad', '']) for _ in range(rng.randint(0, 3)))
+    profile['StateWasteCode'] = rng.choice(['', 'VSQG219H', None])
+    return profile
+
+
+@pytest.fixture(scope='module')
+def mapper():
+    return TradebeProfileMapper()
+
+
+@pytest.mark.parametrize('text, codes', [
+    ('spent solvent F003, F005 blend', {'F003', 'F005'}),
+    ('listed as f002', {'F002'}),
+    ('RQ, (D001/D018), 3, PG II', {'D001', 'D018'}),
+    ('F001abc', {'F001'}),
+    ('BATCHD001', set()),
+    ('batchd001', set()),
+    ('7D0019', set()),
+    ('lot F0012', set()),
+    ('9F001', set()),
+    ('F999 and K000', set()),
+])
+def test_code_boundaries(text, codes):
+    assert find_waste_codes(text) == codes
+    assert scan_value(text) & RCRA_WASTE_CODES == codes
+
+
+def test_code_does_not_span_fields(mapper):
+    assert mapper._get_waste_codes({'A': 'F', 'B': '001'}) == []
+    assert mapper._get_waste_codes({'A': 'BATCH', 'B': 'D001'}) == ['D001']
+
+
+def test_matched_code_is_added_whole(mapper):
+    # The per-code scan added matches with set.update(code), i.e. 'F', '0', '0', '3'
+    assert mapper._get_waste_codes({'WasteStreamDescription': 'spent solvent F003'}) == ['F003']
+
+
+@pytest.mark.parametrize('field', ['hazardouswastenoU', 'hazardouswastenou'])
+def test_u_listing_fields(field):
+    assert get_declared_waste_codes({'WCHazardousU': 'Yes', field: 'u999, U002,x'}) == {'U999', 'U002'}
+    assert get_declared_waste_codes({'WCHazardousU': 'No', field: 'U002'}) == set()
+
+
+def test_listed_codes_need_their_letter():
+    assert get_declared_waste_codes({'WCHazardousP': 'Yes', 'hazardouswastenoP': 'U999, P0001, p001'}) == {'P001'}
+
+
+def test_sample_profile(mapper, sample_profile):
+    assert mapper._get_waste_codes(sample_profile) == expected_waste_codes(sample_profile)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_generated_profiles(mapper, seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        profile = random_profile(rng)
+        assert mapper._get_waste_codes(profile) == expected_waste_codes(profile), json.dumps(profile)